@@ -34,10 +34,10 @@ class VisualizadorRed:
 
     def generar_nodos(self):
         """Recrea las coordenadas exactas usando la misma semilla."""
-        random.seed(seed)
+        rng = random.Random(seed)  #generador propio, no altera el estado global de 'random'
         for id_nodo in range(num_nodes):
-            x = random.uniform(0, area_size)
-            y = random.uniform(0, area_size)
+            x = rng.uniform(0, area_size)
+            y = rng.uniform(0, area_size)
             self.nodos.append({'id': id_nodo, 'x': x, 'y': y})
 
     def neighbors(self, nodo1, nodo2):
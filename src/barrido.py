@@ -0,0 +1,108 @@
+import csv
+import hashlib
+import itertools
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from escenarios import WARMUP, DISCOVERY_SPACING, discovery_schedule, discovery_latencies, stream_seeds
+from registro_eventos import EventLog, EventType, LogLevel
+from simulador_aodv import setup_network
+
+'''
+Barrido de parametros: muchas corridas independientes de la simulacion repartidas en un
+ProcessPoolExecutor, una simulacion por tarea. Cada corrida recibe su propia semilla derivada
+de la semilla base y de sus parametros con SeedSequence, asi los resultados no dependen del orden
+ni del numero de procesos; de esa semilla salen generadores independientes para la red y para los
+pares de cada busqueda (stream_seeds). Las metricas de cada corrida salen del EventLog y se juntan
+en una sola tabla.
+'''
+
+CONTROL_EVENTS = (EventType.DISCOVERY_START, EventType.RREQ_RETRY, EventType.RREQ_FORWARDED, EventType.RREP_SENT,
+                  EventType.RREP_FORWARDED, EventType.RERR_SENT)
+
+
+def run_one(config):
+    """Una corrida completa; regresa una fila de la tabla de resultados."""
+    network_seed, pairs_seed = stream_seeds(config['seed'], 2)
+    rng = random.Random(pairs_seed)
+    event_log = EventLog(LogLevel.HOPS)
+    env, nodes = setup_network(config['num_nodes'], config['area_size'], config['coverage_radius'],
+                               event_log=event_log, seed=network_seed)
+    pairs = [tuple(rng.sample(range(config['num_nodes']), 2)) for _ in range(config['discoveries'])]
+    env.process(discovery_schedule(env, nodes, pairs))
+    env.run(until=WARMUP + DISCOVERY_SPACING * len(pairs))
+
+    events = event_log.as_arrays()
+    kind = events['event']
+    latencies, hops = discovery_latencies(events)
+
+    #las parejas que ya tenian ruta no inundan nada; las metricas de descubrimiento son por busqueda iniciada
+    started = int(np.count_nonzero(kind == EventType.DISCOVERY_START))
+    data_sent = int(np.count_nonzero(kind == EventType.DATA_SENT))
+    data_delivered = int(np.count_nonzero(kind == EventType.DATA_DELIVERED))
+    control = int(np.count_nonzero(np.isin(kind, CONTROL_EVENTS)))
+    return {
+        **config,
+        'cached_routes': (len(pairs) - started) / len(pairs),
+        'route_success': len(latencies) / started if started else math.nan,
+        'discovery_latency': float(np.mean(latencies)) if len(latencies) else math.nan,
+        'hop_count': float(np.mean(hops)) if len(hops) else math.nan,
+        'control_per_discovery': control / started if started else math.nan,
+        'delivery_ratio': data_delivered / data_sent if data_sent else math.nan,
+    }
+
+
+def build_configs(grid, replications, base_seed=42, discoveries=10):
+    """
+    Producto cartesiano de 'grid' (nombre -> lista de valores) por 'replications'.
+    La semilla de cada corrida solo depende de la semilla base, sus parametros y su replica,
+    asi agregar valores al grid no cambia las corridas que ya existian.
+    """
+    names = list(grid)
+    configs = []
+    for values in itertools.product(*(grid[n] for n in names)):
+        combo = dict(zip(names, values))
+        for replica in range(replications):
+            configs.append({**combo, 'replica': replica, 'discoveries': discoveries,
+                            'seed': derive_seed(base_seed, combo, replica)})
+    return configs
+
+
+def derive_seed(base_seed, params, replica):
+    digest = hashlib.sha256(repr(sorted(params.items())).encode()).digest()
+    sequence = np.random.SeedSequence(base_seed, spawn_key=(int.from_bytes(digest[:8], 'little'), replica))
+    return int(sequence.generate_state(1)[0])
+
+
+def run_sweep(configs, workers=None):
+    """Corre todas las configuraciones en paralelo; el orden de la tabla es el de 'configs'."""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run_one, configs, chunksize=1))
+
+
+def write_csv(rows, path):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    grid = {
+        'num_nodes': [50, 100, 200],
+        'area_size': [150],
+        'coverage_radius': [25, 35],
+    }
+    configs = build_configs(grid, replications=4)
+    rows = run_sweep(configs, workers=os.cpu_count())
+
+    print(f"{'nodos':>6} {'radio':>6} {'exito':>7} {'latencia':>9} {'saltos':>7} {'control':>8} {'entrega':>8}")
+    for key, group in itertools.groupby(rows, key=lambda r: (r['num_nodes'], r['coverage_radius'])):
+        group = list(group)
+        mean = lambda field: np.nanmean([r[field] for r in group])
+        print(f"{key[0]:>6} {key[1]:>6} {mean('route_success'):>7.2f} {mean('discovery_latency'):>9.3f} "
+              f"{mean('hop_count'):>7.2f} {mean('control_per_discovery'):>8.1f} {mean('delivery_ratio'):>8.2f}")
@@ -0,0 +1,74 @@
+import random
+
+import numpy as np
+
+from escenarios import area_for, discovery_schedule, discovery_latencies, WARMUP, DISCOVERY_SPACING
+from motor_eventos import Engine
+from registro_eventos import EventLog, EventType, LogLevel
+from simulador_aodv import setup_network, run_simulation
+
+'''
+Cuanto ahorra revisar la componente conexa antes de buscar ruta (reachability_check).
+Primero el escenario de simulador_aodv: la busqueda 0 -> 16 (nodo aislado). Despues redes dispersas
+de NUM_NODES nodos con radio cada vez menor (mas componentes) y DISCOVERIES busquedas al azar.
+Se cuentan los eventos procesados (Engine.processed), los RREQ reenviados, las busquedas fallidas y el
+tiempo simulado que el origen espero cada busqueda que fallo (de DISCOVERY_START a DISCOVERY_FAILED).
+'''
+
+NUM_NODES = 300
+AREA_SIZE = area_for(NUM_NODES)
+RADII = (35, 28, 22, 18)
+DISCOVERIES = 40
+MODES = (('sin anillo', {}), ('anillo expansivo', {'expanding_ring': True}))
+
+
+def measure(event_log, env):
+    events = event_log.as_arrays()
+    kind = events['event']
+    waited, _ = discovery_latencies(events, EventType.DISCOVERY_FAILED)  #los fallos en el acto no esperan
+    return {
+        'events': env.processed,
+        'rreq_forwarded': int(np.count_nonzero(kind == EventType.RREQ_FORWARDED)),
+        'failed': int(np.count_nonzero(kind == EventType.DISCOVERY_FAILED)),
+        'waited': float(waited.sum()),
+    }
+
+
+def demo(check, options):
+    event_log = EventLog(LogLevel.HOPS)
+    env, nodes = setup_network(event_log=event_log, env=Engine(), reachability_check=check, **options)
+    for node in nodes:
+        node.on_route_found = None
+    env.process(run_simulation(env, nodes, 0, 16))
+    env.run(until=60)
+    return measure(event_log, env)
+
+
+def sparse(coverage_radius, check, options):
+    event_log = EventLog(LogLevel.HOPS)
+    env, nodes = setup_network(NUM_NODES, AREA_SIZE, coverage_radius, event_log=event_log, env=Engine(),
+                               reachability_check=check, **options)
+    for node in nodes:
+        node.on_route_found = None
+    rng = random.Random(8)
+    pairs = [tuple(rng.sample(range(NUM_NODES), 2)) for _ in range(DISCOVERIES)]
+    env.process(discovery_schedule(env, nodes, pairs))
+    env.run(until=WARMUP + DISCOVERY_SPACING * DISCOVERIES + 60)  #y tiempo para que fallen las ultimas
+    return measure(event_log, env), nodes[0].topology.connected_components().count
+
+
+def report(name, plain, checked):
+    saved = 1 - checked['events'] / plain['events']
+    print(f"{name:>30}: eventos {plain['events']:>8} -> {checked['events']:>8} ({saved:.1%} menos), "
+          f"RREQ reenviados {plain['rreq_forwarded']:>6} -> {checked['rreq_forwarded']:>6}, "
+          f"fallidas {plain['failed']:>3}, espera {plain['waited']:>7.1f} s -> {checked['waited']:>6.1f} s")
+
+
+if __name__ == "__main__":
+    for mode, options in MODES:
+        print(f"== {mode}")
+        report('simulador_aodv, 0 -> 16', demo(False, options), demo(True, options))
+        for radius in RADII:
+            plain, components = sparse(radius, False, options)
+            checked, _ = sparse(radius, True, options)
+            report(f'{NUM_NODES} nodos, radio {radius} ({components} comp.)', plain, checked)
@@ -0,0 +1,72 @@
+import math
+import random
+
+import numpy as np
+
+from escenarios import WARMUP, DISCOVERY_SPACING, area_for, discovery_schedule, discovery_latencies
+from registro_eventos import EventLog, EventType, LogLevel
+from simulador_aodv import setup_network, NET_TRAVERSAL_TIME, RREQ_RETRIES
+
+'''
+Costo de descubrimiento con y sin busqueda en anillo expansivo: RREQ transmitidos por busqueda
+(el del origen, sus reintentos y cada reenvio), tasa de exito y latencia, sobre la misma topologia
+y los mismos pares origen/destino en ambos casos. Los pares 'cercanos' tienen el destino a menos de
+LOCAL_RANGE del origen (pocos saltos); los 'aleatorios' son cualquier par de la red.
+'''
+
+SIZES = (1000, 2000)
+COVERAGE_RADIUS = 35
+DISCOVERIES = 30
+LOCAL_RANGE = 3 * COVERAGE_RADIUS
+RREQ_EVENTS = (EventType.DISCOVERY_START, EventType.RREQ_RETRY, EventType.RREQ_FORWARDED)
+#tiempo hasta que una busqueda sin respuesta agota todos sus reintentos
+DRAIN_TIME = 5 + NET_TRAVERSAL_TIME * (2 ** (RREQ_RETRIES + 1))
+
+
+def make_pairs(num_nodes, rng, local):
+    if not local:
+        return [tuple(rng.sample(range(num_nodes), 2)) for _ in range(DISCOVERIES)]
+    _, nodes = setup_network(num_nodes, area_for(num_nodes), COVERAGE_RADIUS)
+    positions = nodes[0].topology.positions
+    pairs = []
+    while len(pairs) < DISCOVERIES:
+        source = rng.randrange(num_nodes)
+        dist = np.hypot(*(positions - positions[source]).T)
+        close = np.flatnonzero((dist > 0) & (dist <= LOCAL_RANGE))
+        if len(close):
+            pairs.append((source, int(close[rng.randrange(len(close))])))
+    return pairs
+
+
+def run(num_nodes, expanding_ring, pairs):
+    event_log = EventLog(LogLevel.HOPS)
+    env, nodes = setup_network(num_nodes, area_for(num_nodes), COVERAGE_RADIUS, event_log=event_log,
+                               expanding_ring=expanding_ring)
+    for node in nodes:
+        node.on_route_found = None
+    env.process(discovery_schedule(env, nodes, pairs))
+    env.run(until=WARMUP + DISCOVERY_SPACING * len(pairs) + DRAIN_TIME)
+
+    events = event_log.as_arrays()
+    kind = events['event']
+    latencies, _ = discovery_latencies(events)  #latencia del primer RREP de cada busqueda
+    started = max(int(np.count_nonzero(kind == EventType.DISCOVERY_START)), 1)  #los pares con ruta no inundan
+    return {
+        'rreqs': int(np.count_nonzero(np.isin(kind, RREQ_EVENTS))) / started,
+        'success': len(latencies) / started,
+        'latency': float(np.mean(latencies)) if len(latencies) else math.nan,
+    }
+
+
+if __name__ == "__main__":
+    print(f"{'nodos':>6} {'pares':>10} {'modo':>10} {'RREQ/busqueda':>14} {'exito':>6} {'latencia':>9}")
+    for num_nodes in SIZES:
+        for scenario, local in (('cercanos', True), ('aleatorios', False)):
+            pairs = make_pairs(num_nodes, random.Random(num_nodes), local)
+            results = {}
+            for mode, expanding_ring in (('inundacion', False), ('anillo', True)):
+                r = results[mode] = run(num_nodes, expanding_ring, pairs)
+                print(f"{num_nodes:>6} {scenario:>10} {mode:>10} {r['rreqs']:>14.1f} {r['success']:>6.2f} "
+                      f"{r['latency']:>9.3f}")
+            saving = 1 - results['anillo']['rreqs'] / results['inundacion']['rreqs']
+            print(f"{num_nodes:>6} {scenario:>10} {'reduccion':>10} {saving:>14.1%}")
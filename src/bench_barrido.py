@@ -0,0 +1,39 @@
+import os
+import time
+
+from barrido import build_configs, run_one, run_sweep
+
+'''
+Escalamiento de run_sweep con el numero de procesos: el mismo barrido (corridas independientes, una por
+tarea) con 1, 2, 4 y os.cpu_count() procesos, contra la corrida en serie en el proceso principal. Cada
+corrida deriva su semilla de sus parametros, asi que la tabla debe salir identica con cualquier numero
+de procesos (se compara con repr: NaN != NaN). El speedup ideal es lineal hasta el numero de nucleos;
+arriba de eso solo se agrega el costo del pool (arrancar procesos y pasar configuraciones y filas por pickle).
+'''
+
+GRID = {
+    'num_nodes': [100, 200],
+    'area_size': [150],
+    'coverage_radius': [25, 35],
+}
+REPLICATIONS = 4  #16 corridas: suficientes tareas para repartir entre 4+ procesos
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    configs = build_configs(GRID, REPLICATIONS)
+    cores = os.cpu_count()
+    serial_rows, serial_time = timed(lambda: [run_one(config) for config in configs])
+
+    print(f"{len(configs)} corridas, {cores} nucleos; en serie (sin pool): {serial_time:.2f}s")
+    print(f"{'procesos':>8} {'tiempo':>8} {'speedup':>8} {'eficiencia':>11} {'misma tabla':>12}")
+    for workers in sorted({1, 2, 4, cores}):
+        rows, elapsed = timed(run_sweep, configs, workers=workers)
+        speedup = serial_time / elapsed
+        print(f"{workers:>8} {elapsed:>7.2f}s {speedup:>8.2f} {speedup / min(workers, cores):>11.0%} "
+              f"{str(repr(rows) == repr(serial_rows)):>12}")
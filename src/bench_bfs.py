@@ -0,0 +1,62 @@
+import math
+import random
+import time
+
+import numpy as np
+
+from escenarios import area_for
+from inundacion import discover_pairs
+from registro_eventos import EventLog, EventType, LogLevel
+from simulador_aodv import setup_network, PATH_DISCOVERY_TIME, LINK_DELAY
+
+'''
+Resultados de busqueda de ruta para PAIRS pares origen/destino al azar en una red de 10k nodos:
+con la inundacion en bloque (discover_pairs) contra la simulacion por eventos, que se mide en
+EVENT_PAIRS busquedas (una a la vez, como en la red real, con sus HELLO) y se extrapola al total de pares.
+Las busquedas por eventos tambien se comparan contra el resultado en bloque: una busqueda falla si su RREP
+no regresa antes de PATH_DISCOVERY_TIME, asi que en bloque solo cuentan los destinos a MAX_HOPS o menos.
+'''
+
+NUM_NODES = 10000
+COVERAGE_RADIUS = 35
+PAIRS = 5000
+EVENT_PAIRS = 10
+MAX_HOPS = math.ceil(PATH_DISCOVERY_TIME / (2 * LINK_DELAY)) - 1  #ida y vuelta antes de que expire la busqueda
+
+
+def event_discoveries(pairs):
+    area_size = area_for(NUM_NODES)
+    event_log = EventLog(LogLevel.ROUTES)
+    env, nodes = setup_network(NUM_NODES, area_size, COVERAGE_RADIUS, event_log=event_log)
+    for node in nodes:
+        node.on_route_found = None
+    env.run(until=1.0)
+    start = time.perf_counter()
+    for source, dest in pairs:
+        nodes[source].initiate_route_discovery(dest)
+        env.run(until=env.now + PATH_DISCOVERY_TIME)
+    elapsed = time.perf_counter() - start
+
+    events = event_log.as_arrays()
+    found = events['event'] == EventType.ROUTE_FOUND
+    hops = dict(zip(zip(events['node'][found].tolist(), events['src'][found].tolist()),
+                    events['hop_count'][found].tolist()))
+    return elapsed, [hops.get(pair, -1) for pair in pairs], nodes[0].topology
+
+
+if __name__ == "__main__":
+    rng = random.Random(21)
+    pairs = [tuple(rng.sample(range(NUM_NODES), 2)) for _ in range(PAIRS)]
+
+    event_time, event_hops, topology = event_discoveries(pairs[:EVENT_PAIRS])
+    start = time.perf_counter()
+    result = discover_pairs(topology, pairs, max_hops=MAX_HOPS)
+    bulk_time = time.perf_counter() - start
+
+    per_discovery = event_time / EVENT_PAIRS
+    print(f"{NUM_NODES} nodos, {PAIRS} pares ({len(set(s for s, _ in pairs))} origenes distintos)")
+    print(f"eventos: {per_discovery * 1000:.1f} ms por busqueda -> {per_discovery * PAIRS:.0f} s estimados")
+    print(f"en bloque: {bulk_time:.2f} s ({per_discovery * PAIRS / bulk_time:.0f}x), "
+          f"rutas encontradas {result['found'].mean():.3f}, saltos promedio {result['hops'][result['found']].mean():.2f}")
+    bulk_hops = np.where(result['found'], result['hops'], -1)[:EVENT_PAIRS]
+    print("mismos resultados que los eventos:", np.array_equal(bulk_hops, event_hops))
@@ -0,0 +1,31 @@
+import random
+
+from escenarios import area_for, random_discoveries
+from cache_duplicados import merge_stats
+from simulador_aodv import setup_network
+
+'''
+Corrida larga con descubrimientos continuos: cada DISCOVERY_INTERVAL segundos un nodo al azar busca
+a otro nodo al azar. Compara el tamanio del cache de RREQ con caducidad contra lo que hubiera
+acumulado el set sin limite (una entrada por cada inundacion escuchada).
+'''
+
+NUM_NODES = 300
+COVERAGE_RADIUS = 35
+DISCOVERY_INTERVAL = 0.5
+SIM_TIME = 600
+
+
+if __name__ == "__main__":
+    area_size = area_for(NUM_NODES)
+    env, nodes = setup_network(NUM_NODES, area_size, COVERAGE_RADIUS)
+    env.process(random_discoveries(env, nodes, random.Random(7), DISCOVERY_INTERVAL))
+    env.run(until=SIM_TIME)
+
+    stats = merge_stats(node.seen_rreqs for node in nodes)
+    unbounded = stats['size'] + stats['evictions']  #el set anterior nunca borraba nada
+    print(f"{NUM_NODES} nodos, {SIM_TIME} s simulados, {int(SIM_TIME / DISCOVERY_INTERVAL)} descubrimientos")
+    print(f"entradas con set sin limite: {unbounded} ({unbounded / NUM_NODES:.0f} por nodo)")
+    print(f"entradas con cache:          {stats['size']} ({stats['size'] / NUM_NODES:.1f} por nodo)")
+    print(f"aciertos: {stats['hits']}, fallos: {stats['misses']}, tasa de acierto: {stats['hit_rate']:.1%}")
+    print(f"desalojos: {stats['evictions']}")
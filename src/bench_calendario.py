@@ -0,0 +1,67 @@
+import gc
+import time
+
+from motor_eventos import Engine, CalendarEngine
+from simulador_aodv import LINK_DELAY, HELLO_INTERVAL, BROADCAST_JITTER
+import bench_motor
+
+'''
+Cola de calendario (CalendarEngine) contra el heap binario (Engine).
+Primero solo la cola: oleadas de WAVE callbacks que reprograman a cada uno LINK_DELAY despues (y uno
+de cada HELLO_EVERY a HELLO_INTERVAL), la forma de la carga del simulador sin el costo de los nodos.
+Despues la inundacion de 10k nodos de bench_motor, sin jitter (unos pocos tiempos distintos) y con
+jitter (cada broadcast abre su propia casilla, el peor caso de la cola de calendario).
+Cada caso se corre REPEATS veces alternando las dos colas y se reporta la mejor de cada una.
+'''
+
+WAVE = 200000
+WAVES = 10
+HELLO_EVERY = 50
+REPEATS = 3
+
+
+def queue_only(engine_class):
+    env = engine_class()
+    count = [0]
+    limit = WAVE * WAVES
+
+    def tick(i):
+        count[0] += 1
+        if count[0] + WAVE <= limit:
+            env.call_later(HELLO_INTERVAL if i % HELLO_EVERY == 0 else LINK_DELAY, tick, i)
+
+    for i in range(WAVE):
+        env.call_later(LINK_DELAY, tick, i)
+    start = time.perf_counter()
+    env.run()
+    return env.processed, time.perf_counter() - start
+
+
+def flood(engine_class, jitter):
+    env, _ = bench_motor.build(engine_class(), broadcast_jitter=jitter)
+    start = time.perf_counter()
+    env.run(until=bench_motor.SIM_TIME)
+    return env.processed, time.perf_counter() - start
+
+
+def best(run, *args):
+    """Mejor tiempo de cada cola en REPEATS corridas alternadas (el orden y la basura de la anterior pesan)."""
+    results = {}
+    for _ in range(REPEATS):
+        for engine_class in (Engine, CalendarEngine):
+            gc.collect()
+            events, elapsed = run(engine_class, *args)
+            results[engine_class] = min(results.get(engine_class, (events, elapsed)), (events, elapsed))
+    return results[Engine], results[CalendarEngine]
+
+
+def report(name, results):
+    (heap_events, heap_time), (calendar_events, calendar_time) = results
+    print(f"{name:>26}: {heap_events} eventos | heap {heap_events / heap_time:>11,.0f} ev/s | "
+          f"calendario {calendar_events / calendar_time:>11,.0f} ev/s ({heap_time / calendar_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    report('solo la cola', best(queue_only))
+    report('inundacion 10k', best(flood, 0.0))
+    report('inundacion 10k + jitter', best(flood, BROADCAST_JITTER))
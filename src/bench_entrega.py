@@ -0,0 +1,45 @@
+import time
+
+from escenarios import area_for
+from simulador_aodv import setup_network, run_simulation
+
+'''
+Compara la entrega de paquetes con un proceso 'transmit' por salto (fast_delivery=False)
+contra la entrega con Timeout + callback (fast_delivery=True).
+Ambos modos deben producir exactamente la misma secuencia de recepciones (tiempo, nodo, paquete)
+y las mismas tablas de ruteo; solo cambia el tiempo de reloj.
+'''
+
+NUM_NODES = 5000
+COVERAGE_RADIUS = 35
+
+
+def record_receptions(nodes, log):
+    for node in nodes:
+        def receive(packet, node=node, original=node.receive):
+            log.append((node.env.now, node.node_id, packet.type.name, packet.src))
+            original(packet)
+        node.receive = receive
+
+
+def run(fast_delivery):
+    area_size = area_for(NUM_NODES)
+    env, nodes = setup_network(NUM_NODES, area_size, COVERAGE_RADIUS, fast_delivery=fast_delivery)
+    log = []
+    record_receptions(nodes, log)
+    env.process(run_simulation(env, nodes, 0, NUM_NODES - 1))
+    start = time.perf_counter()
+    env.run(until=10)
+    elapsed = time.perf_counter() - start
+    tables = [{d: (r['next_hop'], r['hops']) for d, r in n.routing_table.items()} for n in nodes]
+    return elapsed, log, tables
+
+
+if __name__ == "__main__":
+    slow_time, slow_log, slow_tables = run(fast_delivery=False)
+    fast_time, fast_log, fast_tables = run(fast_delivery=True)
+    print(f"recepciones: {len(slow_log)}")
+    print(f"proceso por salto: {slow_time:.3f} s")
+    print(f"timeout + callback: {fast_time:.3f} s ({slow_time / fast_time:.1f}x)")
+    print("secuencia de recepciones identica:", slow_log == fast_log)
+    print("tablas de ruteo identicas:", slow_tables == fast_tables)
@@ -0,0 +1,88 @@
+import random
+import time
+
+import numpy as np
+import simpy
+
+from escenarios import area_for, random_discoveries
+from simulador_aodv import setup_network, BROADCAST_JITTER
+
+'''
+Efecto del desfase de los HELLO y del jitter de los broadcasts sobre la cola de eventos con 5k nodos:
+HELLO durante SIM_TIME segundos mas un descubrimiento cada DISCOVERY_INTERVAL. Se mide la
+profundidad de la cola de SimPy despues de cada evento, el mayor numero de eventos con el mismo
+tiempo (rafaga) y el tiempo de pared de la misma corrida con env.run.
+La profundidad sale de env.queue_depth(): la tienen motor_eventos.Engine y CalendarEngine, y para SimPy
+la da CountingEnvironment contando lo que pasa por 'schedule' y 'step' (su API publica).
+'''
+
+NUM_NODES = 5000
+COVERAGE_RADIUS = 35
+SIM_TIME = 20.0
+DISCOVERY_INTERVAL = 2.0
+CONFIGS = (
+    ('HELLO por lotes', {}),
+    ('lotes + jitter', {'broadcast_jitter': BROADCAST_JITTER}),
+    ('HELLO con fases', {'hello_phases': True}),
+    ('fases + jitter', {'hello_phases': True, 'broadcast_jitter': BROADCAST_JITTER}),
+    ('proceso por nodo', {'batched_hello': False}),
+    ('procesos + fases + jitter', {'batched_hello': False, 'hello_phases': True, 'broadcast_jitter': BROADCAST_JITTER}),
+)
+
+
+class CountingEnvironment(simpy.Environment):
+    """simpy.Environment que lleva la cuenta de los eventos programados y aun no procesados."""
+
+    def __init__(self, initial_time=0):
+        super().__init__(initial_time)
+        self.depth = 0
+
+    def schedule(self, event, priority=simpy.events.NORMAL, delay=0):
+        self.depth += 1
+        super().schedule(event, priority, delay)
+
+    def step(self):
+        self.depth -= 1
+        super().step()
+
+    def queue_depth(self):
+        return self.depth
+
+
+def build(options, env=None):
+    area_size = area_for(NUM_NODES)
+    env, nodes = setup_network(NUM_NODES, area_size, COVERAGE_RADIUS, env=env, **options)
+    for node in nodes:
+        node.on_route_found = None
+    env.process(random_discoveries(env, nodes, random.Random(5), DISCOVERY_INTERVAL))
+    return env
+
+
+def profile(options, make_env=CountingEnvironment):
+    """Corre paso a paso registrando la profundidad de la cola y el tiempo de cada evento."""
+    env = build(options, make_env())
+    depths, times = [], []
+    while env.peek() < SIM_TIME:
+        env.step()
+        depths.append(env.queue_depth())
+        times.append(env.now)
+    _, bursts = np.unique(np.asarray(times), return_counts=True)
+    return len(times), np.asarray(depths), bursts
+
+
+def wall_time(options):
+    env = build(options)
+    start = time.perf_counter()
+    env.run(until=SIM_TIME)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print(f"{NUM_NODES} nodos, {SIM_TIME} s simulados")
+    print(f"{'configuracion':>26} {'eventos':>9} {'cola media':>11} {'cola max':>9} {'p99':>7} "
+          f"{'rafaga max':>11} {'tiempos':>8} {'pared':>7}")
+    for name, options in CONFIGS:
+        events, depths, bursts = profile(options)
+        elapsed = wall_time(options)
+        print(f"{name:>26} {events:>9} {depths.mean():>11.0f} {depths.max():>9} {np.percentile(depths, 99):>7.0f} "
+              f"{bursts.max():>11} {len(bursts):>8} {elapsed:>6.2f}s")
@@ -0,0 +1,61 @@
+import random
+import time
+
+from escenarios import area_for
+from motor_eventos import Engine
+from simulador_aodv import setup_network
+
+'''
+Eventos por segundo de simpy.Environment contra motor_eventos.Engine en una inundacion de 10k nodos:
+HELLO por lotes mas FLOODS busquedas de ruta entre nodos al azar, una por segundo. El numero de
+eventos se cuenta en una corrida aparte con env.step (SimPy no lleva la cuenta) y el tiempo de
+pared es el de env.run sobre una red nueva; las dos corridas procesan exactamente los mismos eventos.
+'''
+
+NUM_NODES = 10000
+COVERAGE_RADIUS = 35
+FLOODS = 5
+SIM_TIME = 1.0 + FLOODS
+
+
+def floods(env, nodes, rng):
+    for _ in range(FLOODS):
+        yield env.timeout(1.0)
+        source, dest = rng.sample(range(len(nodes)), 2)
+        nodes[source].initiate_route_discovery(dest)
+
+
+def build(env, **options):
+    area_size = area_for(NUM_NODES)
+    env, nodes = setup_network(NUM_NODES, area_size, COVERAGE_RADIUS, env=env, **options)
+    for node in nodes:
+        node.on_route_found = None
+    env.process(floods(env, nodes, random.Random(7)))
+    return env, nodes
+
+
+def count_events(env):
+    events = 0
+    while env.peek() < SIM_TIME:
+        env.step()
+        events += 1
+    return events
+
+
+def timed_run(env):
+    start = time.perf_counter()
+    env.run(until=SIM_TIME)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    simpy_events = count_events(build(None)[0])
+    engine_events = count_events(build(Engine())[0])
+    simpy_time = timed_run(build(None)[0])
+    engine_time = timed_run(build(Engine())[0])
+
+    print(f"{NUM_NODES} nodos, {FLOODS} inundaciones, {SIM_TIME:.0f} s simulados")
+    print(f"eventos: SimPy {simpy_events}, Engine {engine_events}")
+    print(f"simpy.Environment: {simpy_time:.3f} s, {simpy_events / simpy_time:,.0f} eventos/s")
+    print(f"Engine:            {engine_time:.3f} s, {engine_events / engine_time:,.0f} eventos/s "
+          f"({simpy_time / engine_time:.2f}x)")
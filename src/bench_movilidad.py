@@ -0,0 +1,102 @@
+import random
+import time
+
+import numpy as np
+
+from escenarios import area_for
+from movilidad import RandomWaypoint, GaussMarkov, MobilityManager
+from registro_eventos import EventLog, EventType, LogLevel
+from simulador_aodv import setup_network, ACTIVE_ROUTE_TIMEOUT
+from topologia import Topology
+from trafico import Flow, TrafficGenerator
+
+'''
+Movilidad: (1) costo por paso de actualizar la adyacencia de forma incremental (solo se recalculan
+los candidatos de los nodos que cambian de celda) contra recalcularla completa, con 10k nodos,
+verificando que el CSR sea identico; (2) una red AODV en movimiento con flujos CBR, deteccion de
+enlaces caidos y RERR, a varias velocidades, para ver cuanto trabajan las rutas de reparacion.
+'''
+
+COVERAGE_RADIUS = 35
+STEP = 1.0
+STEPS = 20
+MOBILE_SPEEDS = (0.5, 2.0, 5.0)  #velocidad maxima (waypoint) o media (gauss-markov) en la red AODV
+MODELS = (
+    ('random waypoint', lambda area: RandomWaypoint(area, speed_min=1.0, speed_max=5.0, pause=2.0)),
+    ('gauss-markov', lambda area: GaussMarkov(area, alpha=0.75, mean_speed=3.0)),
+)
+
+
+def time_updates(num_nodes, make_model):
+    area_size = area_for(num_nodes)
+    topology = Topology.random(num_nodes, area_size, COVERAGE_RADIUS, random.Random(42))
+    rng = np.random.default_rng(42)
+    model = make_model(area_size)
+    model.start(topology.positions, rng)
+
+    incremental = full = 0.0
+    crossed = changed = 0
+    identical = True
+    for k in range(STEPS):
+        previous_cells = topology.cells
+        model.move(topology.positions, (k + 1) * STEP, STEP, rng)
+        start = time.perf_counter()
+        changed += len(topology.update())
+        incremental += time.perf_counter() - start
+        crossed += int(np.count_nonzero(topology.cells != previous_cells))
+
+        start = time.perf_counter()
+        reference = Topology(topology.positions, COVERAGE_RADIUS)
+        full += time.perf_counter() - start
+        identical &= np.array_equal(reference.indptr, topology.indptr) and np.array_equal(reference.indices,
+                                                                                          topology.indices)
+    return incremental / STEPS, full / STEPS, crossed / STEPS / num_nodes, changed / STEPS / num_nodes, identical
+
+
+def run_mobile_network(num_nodes, make_model, duration=30.0, flows=20):
+    event_log = EventLog(LogLevel.HOPS)
+    area_size = area_for(num_nodes)
+    env, nodes = setup_network(num_nodes, area_size, COVERAGE_RADIUS, event_log=event_log,
+                               route_timeout=ACTIVE_ROUTE_TIMEOUT, detect_link_breaks=True)
+    if make_model is not None:
+        MobilityManager(env, nodes, make_model(area_size), STEP, np.random.default_rng(7))
+    generator = TrafficGenerator(env, nodes, random.Random(3))
+    generator.add_random_flows(flows, Flow, rate=4.0, start=5.0)
+    start = time.perf_counter()
+    env.run(until=5.0 + duration)
+    elapsed = time.perf_counter() - start
+
+    kind = event_log.as_arrays()['event']
+    count = lambda event: int(np.count_nonzero(kind == event))
+    return {
+        'delivery_ratio': generator.stats.summary(duration)['delivery_ratio'],
+        'link_breaks': count(EventType.LINK_BREAK),
+        'rerr': count(EventType.RERR_SENT),
+        'discoveries': count(EventType.DISCOVERY_START),
+        'failed': count(EventType.DISCOVERY_FAILED),
+        'elapsed': elapsed,
+    }
+
+
+if __name__ == "__main__":
+    num_nodes = 10000
+    print(f"actualizacion de vecinos por paso de {STEP} s, {num_nodes} nodos")
+    print(f"{'modelo':>16} {'incremental':>12} {'completa':>9} {'cruzan celda':>13} {'cambian':>8} {'identico':>9}")
+    for name, make_model in MODELS:
+        incremental, full, crossed, changed, identical = time_updates(num_nodes, make_model)
+        print(f"{name:>16} {incremental * 1e3:>10.1f}ms {full * 1e3:>7.1f}ms {crossed:>13.1%} {changed:>8.1%} "
+              f"{identical!s:>9}")
+
+    num_nodes = 1000
+    print(f"\nred AODV de {num_nodes} nodos, 20 flujos CBR, 30 s, HELLO + RERR")
+    print(f"{'modelo':>24} {'entrega':>8} {'enlaces caidos':>15} {'RERR':>6} {'busquedas':>10} {'fallidas':>9} "
+          f"{'tiempo':>7}")
+    networks = (('estatica', None),) + tuple(
+        (f'random waypoint {v} m/s', lambda area, v=v: RandomWaypoint(area, speed_min=0.1, speed_max=v))
+        for v in MOBILE_SPEEDS) + tuple(
+        (f'gauss-markov {v} m/s', lambda area, v=v: GaussMarkov(area, mean_speed=v, speed_std=v / 3))
+        for v in MOBILE_SPEEDS)
+    for name, make_model in networks:
+        r = run_mobile_network(num_nodes, make_model)
+        print(f"{name:>24} {r['delivery_ratio']:>8.3f} {r['link_breaks']:>15} {r['rerr']:>6} {r['discoveries']:>10} "
+              f"{r['failed']:>9} {r['elapsed']:>6.1f}s")
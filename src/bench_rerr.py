@@ -0,0 +1,89 @@
+import random
+
+import numpy as np
+
+from escenarios import area_for
+from registro_eventos import EventLog, EventType, LogLevel
+from simulador_aodv import setup_network, ACTIVE_ROUTE_TIMEOUT
+from trafico import Flow, TrafficGenerator
+
+'''
+Flujos CBR con nodos que se caen y vuelven (churn). Cada CHURN_INTERVAL segundos se apaga un nodo
+al azar que no es extremo de ningun flujo, durante DOWN_TIME segundos. Compara la red sin
+mantenimiento de rutas, con rutas que caducan, y con deteccion de enlaces caidos por HELLO + RERR:
+tasa de entrega, tiempo sin entregas de cada flujo (cortes de mas de OUTAGE_GAP) y mensajes de
+control por segundo.
+'''
+
+NUM_NODES = 300
+COVERAGE_RADIUS = 35
+FLOWS = 30
+RATE = 4.0
+WARMUP = 5.0
+DURATION = 200.0
+CHURN_INTERVAL = 5.0
+DOWN_TIME = 30.0
+OUTAGE_GAP = 1.0
+CONTROL_EVENTS = (EventType.DISCOVERY_START, EventType.RREQ_RETRY, EventType.RREQ_FORWARDED,
+                  EventType.RREP_SENT, EventType.RREP_FORWARDED, EventType.RERR_SENT)
+MODES = (
+    ('sin mantenimiento', {}),
+    ('caducidad', {'route_timeout': ACTIVE_ROUTE_TIMEOUT}),
+    ('HELLO + RERR', {'route_timeout': ACTIVE_ROUTE_TIMEOUT, 'detect_link_breaks': True}),
+)
+
+
+def churn(env, nodes, endpoints, rng):
+    yield env.timeout(WARMUP)
+    candidates = [node for node in nodes if node.node_id not in endpoints]
+    while True:
+        yield env.timeout(CHURN_INTERVAL)
+        victim = rng.choice(candidates)
+        victim.power_off()
+        env.timeout(DOWN_TIME, victim).callbacks.append(lambda event: event.value.power_on())
+
+
+def run(options):
+    event_log = EventLog(LogLevel.HOPS)
+    area_size = area_for(NUM_NODES)
+    env, nodes = setup_network(NUM_NODES, area_size, COVERAGE_RADIUS, event_log=event_log, **options)
+    generator = TrafficGenerator(env, nodes, random.Random(3))
+    generator.add_random_flows(FLOWS, Flow, rate=RATE, start=WARMUP)
+
+    deliveries = [[] for _ in range(FLOWS)]
+    record_delivery = generator.stats.record_delivery
+
+    def sink(packet):
+        record_delivery(packet)
+        deliveries[packet.flow_id].append(env.now)
+
+    for node in nodes:
+        node.data_sink = sink
+    endpoints = {n for flow in generator.flows for n in (flow.source, flow.dest)}
+    env.process(churn(env, nodes, endpoints, random.Random(11)))
+    env.run(until=WARMUP + DURATION)
+
+    outages = []
+    for times in deliveries:
+        #el tiempo de simulacion despues de la ultima entrega tambien cuenta como corte
+        edges = np.concatenate(([WARMUP], times, [WARMUP + DURATION]))
+        gaps = np.diff(edges)
+        outages.extend(gaps[gaps > OUTAGE_GAP].tolist())
+    kind = event_log.as_arrays()['event']
+    summary = generator.stats.summary(DURATION)
+    return {
+        'delivery_ratio': summary['delivery_ratio'],
+        'outages': len(outages),
+        'outage_mean': float(np.mean(outages)) if outages else 0.0,
+        'outage_total': float(np.sum(outages)) / FLOWS,
+        'control_rate': int(np.count_nonzero(np.isin(kind, CONTROL_EVENTS))) / DURATION,
+    }
+
+
+if __name__ == "__main__":
+    print(f"{NUM_NODES} nodos, {FLOWS} flujos CBR a {RATE} pps, un nodo cae cada {CHURN_INTERVAL} s por {DOWN_TIME} s")
+    print(f"{'modo':>18} {'entrega':>8} {'cortes':>7} {'corte medio':>12} {'sin servicio/flujo':>19} {'control/s':>10}")
+    for name, options in MODES:
+        r = run(options)
+        print(f"{name:>18} {r['delivery_ratio']:>8.3f} {r['outages']:>7} {r['outage_mean']:>11.2f}s "
+              f"{r['outage_total']:>18.1f}s {r['control_rate']:>10.1f}")
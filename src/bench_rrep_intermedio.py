@@ -0,0 +1,70 @@
+import math
+import random
+
+import numpy as np
+
+from escenarios import WARMUP, DISCOVERY_SPACING, area_for, discovery_schedule, discovery_latencies
+from registro_eventos import EventLog, EventType, LogLevel
+from simulador_aodv import setup_network
+
+'''
+Descubrimientos con rutas ya calientes: muchos origenes buscan a unos pocos destinos (servidores).
+Compara solo el destino respondiendo contra nodos intermedios respondiendo con rutas frescas
+(y con RREP gratuito), midiendo RREQ transmitidos, RREP y latencia por busqueda. Las primeras
+WARM_DISCOVERIES busquedas solo calientan las tablas y no se cuentan.
+'''
+
+SIZES = (1000, 2000)
+COVERAGE_RADIUS = 35
+SINKS = 5
+WARM_DISCOVERIES = 10
+DISCOVERIES = 40
+RREQ_EVENTS = (EventType.DISCOVERY_START, EventType.RREQ_RETRY, EventType.RREQ_FORWARDED)
+RREP_EVENTS = (EventType.RREP_SENT, EventType.RREP_FORWARDED)
+MODES = (
+    ('destino', {}),
+    ('intermedio', {'intermediate_rrep': True}),
+    ('gratuito', {'intermediate_rrep': True, 'gratuitous_rrep': True}),
+)
+
+
+def make_pairs(num_nodes, rng):
+    sinks = rng.sample(range(num_nodes), SINKS)
+    pairs = []
+    while len(pairs) < WARM_DISCOVERIES + DISCOVERIES:
+        source, dest = rng.randrange(num_nodes), rng.choice(sinks)
+        if source != dest:
+            pairs.append((source, dest))
+    return pairs
+
+
+def run(num_nodes, pairs, **options):
+    event_log = EventLog(LogLevel.HOPS)
+    env, nodes = setup_network(num_nodes, area_for(num_nodes), COVERAGE_RADIUS, event_log=event_log, **options)
+    for node in nodes:
+        node.on_route_found = None
+    env.process(discovery_schedule(env, nodes, pairs))
+    env.run(until=WARMUP + DISCOVERY_SPACING * len(pairs))
+
+    events = event_log.as_arrays()
+    measured = events['time'] >= WARMUP + DISCOVERY_SPACING * WARM_DISCOVERIES
+    events = {column: values[measured] for column, values in events.items()}
+    kind = events['event']
+    latencies, _ = discovery_latencies(events)
+    started = max(int(np.count_nonzero(kind == EventType.DISCOVERY_START)), 1)  #los pares con ruta no inundan
+    return {
+        'rreqs': np.count_nonzero(np.isin(kind, RREQ_EVENTS)) / started,
+        'rreps': np.count_nonzero(np.isin(kind, RREP_EVENTS)) / started,
+        'success': len(latencies) / started,
+        'latency': float(np.mean(latencies)) if len(latencies) else math.nan,
+    }
+
+
+if __name__ == "__main__":
+    print(f"{'nodos':>6} {'responde':>10} {'RREQ/busqueda':>14} {'RREP/busqueda':>14} {'exito':>6} {'latencia':>9}")
+    for num_nodes in SIZES:
+        pairs = make_pairs(num_nodes, random.Random(num_nodes))
+        for mode, options in MODES:
+            r = run(num_nodes, pairs, **options)
+            print(f"{num_nodes:>6} {mode:>10} {r['rreqs']:>14.1f} {r['rreps']:>14.1f} {r['success']:>6.2f} "
+                  f"{r['latency']:>9.3f}")
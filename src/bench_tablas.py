@@ -0,0 +1,49 @@
+import random
+import sys
+import time
+
+from escenarios import area_for, random_discoveries
+from simulador_aodv import setup_network, ACTIVE_ROUTE_TIMEOUT
+
+'''
+Tamanio de las tablas de ruteo en una corrida de una hora simulada con descubrimientos continuos
+(cada uno manda su paquete de prueba), con rutas que nunca caducan contra rutas con
+ACTIVE_ROUTE_TIMEOUT. Reporta rutas vivas por nodo a lo largo de la corrida y la memoria de las
+columnas del RoutingStore y de los indices dest -> slot de cada nodo. Sin caducidad casi todos los
+descubrimientos encuentran ya una ruta (vieja) en la tabla y no inundan, por eso tambien se reporta
+cuantas inundaciones hubo.
+'''
+
+NUM_NODES = 200
+COVERAGE_RADIUS = 35
+DISCOVERY_INTERVAL = 1.0
+SIM_TIME = 3600
+REPORT_EVERY = 600
+
+
+def index_bytes(store):
+    return sys.getsizeof(store.index) + sum(sys.getsizeof(slots) for slots in store.index.values())
+
+
+def run(route_timeout):
+    area_size = area_for(NUM_NODES)
+    env, nodes = setup_network(NUM_NODES, area_size, COVERAGE_RADIUS, route_timeout=route_timeout)
+    store = nodes[0].routing_table.store
+    env.process(random_discoveries(env, nodes, random.Random(7), DISCOVERY_INTERVAL))
+    sizes = []
+    start = time.perf_counter()
+    for until in range(REPORT_EVERY, SIM_TIME + 1, REPORT_EVERY):
+        env.run(until=until)
+        sizes.append(len(store) / NUM_NODES)
+    floods = sum(node.broadcast_id for node in nodes)
+    return sizes, store.nbytes(), index_bytes(store), floods, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print(f"{NUM_NODES} nodos, {SIM_TIME} s simulados, un descubrimiento cada {DISCOVERY_INTERVAL} s")
+    header = ' '.join(f"{t:>7}s" for t in range(REPORT_EVERY, SIM_TIME + 1, REPORT_EVERY))
+    print(f"{'rutas por nodo':>22} {header} {'columnas':>9} {'indices':>9} {'inund.':>7} {'tiempo':>7}")
+    for name, route_timeout in (('sin caducidad', None), (f'timeout {ACTIVE_ROUTE_TIMEOUT} s', ACTIVE_ROUTE_TIMEOUT)):
+        sizes, column_bytes, index_size, floods, elapsed = run(route_timeout)
+        row = ' '.join(f"{size:>8.1f}" for size in sizes)
+        print(f"{name:>22} {row} {column_bytes / 1024:>7.0f}KB {index_size / 1024:>7.0f}KB {floods:>7} {elapsed:>6.1f}s")
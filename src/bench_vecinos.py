@@ -0,0 +1,54 @@
+import random
+import time
+
+import simpy
+
+from escenarios import area_for
+from simulador_aodv import Node
+from topologia import Topology
+
+'''
+Benchmark del descubrimiento de vecinos: barrido todos contra todos vs. la cuadricula de Topology
+(celdas del tamanio del radio, cada nodo contra su bloque 3x3 de celdas, vectorizado) que arma la
+adyacencia CSR.
+Se conserva la densidad del escenario original (20 nodos en 100x100, radio 35) escalando el area,
+asi el grado promedio es el mismo para 1k, 10k y 100k nodos.
+'''
+
+COVERAGE_RADIUS = 35
+SCAN_SAMPLE = 500  #con muchos nodos el barrido completo tarda horas, se mide una muestra y se extrapola
+
+
+def build_nodes(num_nodes, seed=42):
+    env = simpy.Environment()
+    area_size = area_for(num_nodes)
+    rng = random.Random(seed)
+    return [Node(env, i, rng.uniform(0, area_size), rng.uniform(0, area_size), COVERAGE_RADIUS) for i in range(num_nodes)]
+
+
+def time_full_scan(nodes):
+    sample = nodes if len(nodes) <= SCAN_SAMPLE else nodes[:SCAN_SAMPLE]
+    start = time.perf_counter()
+    for node in sample:
+        node.calculate_neighbors(nodes)
+    elapsed = time.perf_counter() - start
+    return elapsed * len(nodes) / len(sample), len(sample) < len(nodes)
+
+
+def time_grid(nodes):
+    positions = [(n.x, n.y) for n in nodes]
+    start = time.perf_counter()
+    topology = Topology(positions, COVERAGE_RADIUS)
+    return time.perf_counter() - start, topology
+
+
+if __name__ == "__main__":
+    print(f"{'nodos':>8} {'barrido (s)':>14} {'cuadricula (s)':>15} {'aceleracion':>12} {'grado prom.':>12}")
+    for num_nodes in (1_000, 10_000, 100_000):
+        nodes = build_nodes(num_nodes)
+        grid_time, topology = time_grid(nodes)
+        degree = 2 * topology.num_edges / num_nodes
+        scan_time, estimated = time_full_scan(nodes)
+        mark = '*' if estimated else ' '
+        print(f"{num_nodes:>8} {scan_time:>13.3f}{mark} {grid_time:>15.3f} {scan_time / grid_time:>11.1f}x {degree:>12.1f}")
+    print("* estimado a partir de una muestra de", SCAN_SAMPLE, "nodos")
@@ -0,0 +1,65 @@
+from collections import deque
+
+
+class DuplicateCache:
+    """
+    Cache de RREQ ya vistos ((origen_id, bcast_id)) con caducidad, al estilo PATH_DISCOVERY_TIME de AODV.
+    Cada entrada vive 'lifetime' segundos simulados; como todas viven lo mismo, el orden de insercion
+    es el orden de caducidad y la purga solo revisa el frente de una cola (perezosa, guiada por env.now).
+    Asi la memoria depende de las inundaciones recientes y no del total de inundaciones de la corrida.
+    """
+
+    def __init__(self, env, lifetime):
+        self.env = env
+        self.lifetime = lifetime
+        self.expiry = {}  #clave -> tiempo en que caduca
+        self.order = deque()  #claves en orden de insercion (= orden de caducidad)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def purge(self):
+        now = self.env.now
+        expiry, order = self.expiry, self.order
+        while order and expiry[order[0]] <= now:
+            del expiry[order.popleft()]
+            self.evictions += 1
+
+    def __contains__(self, key):
+        self.purge()
+        if key in self.expiry:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def add(self, key):
+        self.purge()
+        if key not in self.expiry:
+            self.expiry[key] = self.env.now + self.lifetime
+            self.order.append(key)
+
+    def __len__(self):
+        return len(self.expiry)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.expiry),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+def merge_stats(caches):
+    """Suma las estadisticas de los caches de todos los nodos de una red."""
+    total = {'size': 0, 'hits': 0, 'misses': 0, 'evictions': 0}
+    for cache in caches:
+        stats = cache.stats()
+        for key in total:
+            total[key] += stats[key]
+    lookups = total['hits'] + total['misses']
+    total['hit_rate'] = total['hits'] / lookups if lookups else 0.0
+    return total
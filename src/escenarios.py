@@ -0,0 +1,66 @@
+import math
+
+import numpy as np
+
+from registro_eventos import EventType
+
+'''
+Piezas comunes de los escenarios de prueba (barrido, bench_* y verificar_*): el area que conserva la
+densidad del escenario original, los procesos que lanzan busquedas de ruta, la latencia de cada busqueda
+a partir del EventLog y semillas independientes para cada generador de una corrida.
+'''
+
+WARMUP = 1.0  #tiempo para que los HELLO llenen las tablas antes del primer descubrimiento
+DISCOVERY_SPACING = 2.0  #separacion entre descubrimientos de una misma corrida
+
+
+def area_for(num_nodes):
+    """Lado del area con la densidad del escenario original (20 nodos en 100 x 100) para 'num_nodes'."""
+    return 100 * math.sqrt(num_nodes / 20)
+
+
+def discovery_schedule(env, nodes, pairs):
+    yield env.timeout(WARMUP)
+    for source, dest in pairs:
+        nodes[source].initiate_route_discovery(dest)
+        yield env.timeout(DISCOVERY_SPACING)
+
+
+def random_discoveries(env, nodes, rng, interval):
+    """Sin fin: cada 'interval' segundos una busqueda entre un par origen/destino al azar."""
+    while True:
+        yield env.timeout(interval)
+        source, dest = rng.sample(range(len(nodes)), 2)
+        nodes[source].initiate_route_discovery(dest)
+
+
+def discovery_latencies(events, outcome=EventType.ROUTE_FOUND):
+    """
+    Empareja el DISCOVERY_START de cada busqueda con su primer 'outcome' (ROUTE_FOUND o DISCOVERY_FAILED) en
+    las columnas de EventLog.as_arrays (en orden de tiempo). Regresa dos arreglos por busqueda emparejada:
+    el tiempo entre ambos eventos y el hop_count del segundo. Un 'outcome' sin inicio (p. ej. un fallo en el
+    acto) no cuenta.
+    """
+    kind = events['event']
+    #ROUTE_FOUND guarda el destino buscado como 'src' (el origen del RREP); DISCOVERY_FAILED, como 'dest'
+    target = events['src'] if outcome == EventType.ROUTE_FOUND else events['dest']
+    pending = {}  #(origen, destino) -> inicio de la busqueda en curso
+    latencies, hops = [], []
+    for i in np.flatnonzero((kind == EventType.DISCOVERY_START) | (kind == outcome)).tolist():
+        if kind[i] == EventType.DISCOVERY_START:
+            pending[(events['node'][i], events['dest'][i])] = events['time'][i]
+        else:
+            start = pending.pop((events['node'][i], target[i]), None)
+            if start is not None:
+                latencies.append(events['time'][i] - start)
+                hops.append(events['hop_count'][i])
+    return np.asarray(latencies, dtype=np.float64), np.asarray(hops, dtype=np.int64)
+
+
+def stream_seeds(seed, count):
+    """
+    'count' semillas independientes derivadas de la semilla de una corrida (SeedSequence.spawn), una por
+    generador (red, pares, trafico...). Dos random.Random con la misma semilla dan la misma secuencia, asi
+    que la red y lo que se sortea sobre ella no deben compartirla.
+    """
+    return [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(count)]
@@ -0,0 +1,122 @@
+import math
+
+import numpy as np
+
+from tabla_rutas import NO_ROUTE
+
+'''
+Inundacion de RREQ en bloque. Con la topologia fija, sin perdidas, sin jitter y sin RREP intermedio,
+una inundacion de handle_rreq es un BFS por niveles sobre la adyacencia CSR: todos los saltos tardan
+LINK_DELAY, asi el nivel k recibe el RREQ en el instante k * LINK_DELAY. Cada frontera se calcula con
+NumPy y las rutas inversas de todos los nodos alcanzados se escriben con RoutingStore.bulk_update.
+
+Desempate igual al de los eventos: en el instante de un nivel, los nodos del nivel anterior se procesaron
+en orden (su primer RREQ) y cada uno programo las entregas a sus vecinos en el orden de su fila CSR.
+Por eso el primer RREQ de un nodo viene del vecino del nivel anterior que se proceso primero, y el orden
+del nivel nuevo es el de (orden del padre, posicion en la fila del padre).
+'''
+
+UNREACHED = -1
+BATCH_SIZE = 128  #inundaciones por recorrido en discover_pairs; la memoria es 3 * BATCH_SIZE * n enteros
+
+
+def expand(indptr, indices, frontier):
+    """
+    Vecinos de todas las filas de 'frontier', en el orden de la frontera y de cada fila, y el fin de cada
+    fila en ese arreglo (para recuperar de que nodo de la frontera salio cada vecino con searchsorted).
+    """
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    ends = np.cumsum(counts)
+    positions = np.arange(int(ends[-1]), dtype=np.int32) + np.repeat(starts - (ends - counts), counts)
+    return indices[positions], ends
+
+
+def flood_trees(topology, sources, ttl=math.inf, stops=None):
+    """
+    Arboles de las inundaciones de un RREQ de cada nodo de 'sources' con TTL 'ttl', todas en el mismo
+    recorrido por niveles (la frontera es de pares (inundacion, nodo) y el orden dentro de cada inundacion
+    se conserva). Regresa tres matrices (inundacion, nodo):
+    parent (de quien recibio el primer RREQ = siguiente salto de su ruta inversa, NO_ROUTE si no le llego),
+    hops (saltos hasta el origen, UNREACHED si no le llego) y first_hop (vecino del origen por el que
+    paso el RREQ = siguiente salto del origen hacia ese nodo cuando regrese el RREP).
+    'stops' son los destinos de cada RREQ: lo reciben pero no lo reenvian.
+    """
+    indptr, indices = topology.indptr, topology.indices
+    n = topology.num_nodes
+    batch = len(sources)
+    key_type = np.int32 if batch * n < 2 ** 31 else np.int64  #llave = inundacion * n + nodo
+    sources = np.asarray(sources, dtype=key_type)
+    parent = np.full(batch * n, NO_ROUTE, dtype=np.int32)
+    hops = np.full(batch * n, UNREACHED, dtype=np.int32)
+    first_hop = np.full(batch * n, NO_ROUTE, dtype=np.int32)
+    offset = np.arange(batch, dtype=key_type) * n  #inicio de cada inundacion en las matrices aplanadas
+    hops[offset + sources] = 0
+    stop_keys = None if stops is None else offset + np.asarray(stops, dtype=key_type)
+
+    flood, frontier = np.arange(batch, dtype=key_type), sources
+    level = 0
+    while len(frontier) and level < ttl:
+        level += 1
+        children, ends = expand(indptr, indices, frontier)
+        #solo de los vecinos que aun no tienen el RREQ se busca de que nodo de la frontera salieron
+        keys = children + np.repeat(flood * n, np.diff(ends, prepend=0))
+        fresh = np.flatnonzero(hops[keys] == UNREACHED)
+        #la primera aparicion de cada nodo es su primer RREQ; se conserva el orden de llegada
+        _, first = np.unique(keys[fresh], return_index=True)
+        first.sort()
+        fresh = fresh[first]
+        row = np.searchsorted(ends, fresh, side='right')
+        parents, keys, floods = frontier[row], keys[fresh], flood[row]
+
+        parent[keys] = parents
+        hops[keys] = level
+        first_hop[keys] = keys - floods * n if level == 1 else first_hop[floods * n + parents]
+        if stop_keys is not None:
+            forwards = keys != stop_keys[floods]
+            keys, floods = keys[forwards], floods[forwards]
+        flood, frontier = floods, keys - floods * n
+    return parent.reshape(batch, n), hops.reshape(batch, n), first_hop.reshape(batch, n)
+
+
+def flood_tree(topology, source, ttl=math.inf, stop=None):
+    """flood_trees de un solo origen: (parent, hops, first_hop) por nodo."""
+    parent, hops, first_hop = flood_trees(topology, [source], ttl, None if stop is None else [stop])
+    return parent[0], hops[0], first_hop[0]
+
+
+def install_reverse_routes(routing_store, source, parent, hops, seq_no, expiry=None):
+    """
+    Lo que deja handle_rreq en cada nodo alcanzado: la ruta hacia 'source' por su 'parent', con el
+    no. de secuencia del RREQ. 'expiry' es un escalar o un arreglo por nodo (None: no caducan).
+    Regresa cuantas rutas se escribieron.
+    """
+    reached = np.flatnonzero(hops > 0)
+    if expiry is not None and np.ndim(expiry):
+        expiry = np.asarray(expiry)[reached]
+    written = routing_store.bulk_update(reached, source, parent[reached], hops[reached], seq_no, expiry)
+    return int(np.count_nonzero(written))
+
+
+def discover_pairs(topology, pairs, ttl=math.inf, max_hops=None, batch_size=BATCH_SIZE):
+    """
+    Resultado de la busqueda de ruta de cada par (origen, destino): una inundacion por origen distinto sirve a
+    todos sus destinos, porque que el destino no reenvie el RREQ no cambia el camino por el que le llega.
+    Los origenes se recorren de 'batch_size' en 'batch_size' con flood_trees.
+    'max_hops' es el destino mas lejano cuyo RREP regresa antes de que expire la busqueda (p. ej.
+    PATH_DISCOVERY_TIME / (2 * LINK_DELAY) sin anillo): mas lejos el RREQ llega pero la busqueda falla.
+    Regresa arreglos por par: found, hops (saltos del RREP = ROUTE_FOUND) y next_hop del origen.
+    """
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    sources, row = np.unique(pairs[:, 0], return_inverse=True)
+    found = np.zeros(len(pairs), dtype=bool)
+    hop_count = np.full(len(pairs), UNREACHED, dtype=np.int32)
+    next_hop = np.full(len(pairs), NO_ROUTE, dtype=np.int32)
+    for start in range(0, len(sources), batch_size):
+        _, hops, first_hop = flood_trees(topology, sources[start:start + batch_size], ttl)
+        mine = np.flatnonzero((row >= start) & (row < start + batch_size))
+        r, dests = row[mine] - start, pairs[mine, 1]
+        found[mine] = (hops[r, dests] > 0) & (max_hops is None or hops[r, dests] <= max_hops)
+        hop_count[mine] = hops[r, dests]
+        next_hop[mine] = first_hop[r, dests]
+    return {'found': found, 'hops': hop_count, 'next_hop': next_hop}
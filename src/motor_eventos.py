@@ -0,0 +1,220 @@
+import math
+from collections import deque
+from heapq import heappush, heappop
+
+'''
+Motor de eventos discretos ligero, intercambiable con simpy.Environment para lo que usa el simulador:
+env.now, env.timeout(delay, value).callbacks, env.event().succeed(value), env.process(generador),
+env.run(until=...), env.peek() y env.step().
+La cola es un heap de entradas (tiempo, prioridad, seq, callback, arg). Ademas de los eventos con
+callbacks, 'call_later' programa directamente callback(arg) sin crear ningun objeto evento; Node lo usa
+para entregar paquetes cuando el entorno lo ofrece. El orden de los eventos es el mismo que en SimPy:
+por tiempo, luego prioridad (URGENT antes que NORMAL) y luego orden de programacion.
+CalendarEngine guarda lo mismo en casillas por tiempo: casi todos los eventos caen en unos pocos
+instantes (ahora + LINK_DELAY, ahora + HELLO_INTERVAL), asi programar uno es agregarlo al final de una lista.
+'''
+
+URGENT = 0
+NORMAL = 1
+
+
+class StopRun(Exception):
+    """Lo lanza el evento 'until' de Engine.run."""
+
+
+def fire(event):
+    """Procesa un evento: sus callbacks reciben el evento, una sola vez."""
+    callbacks, event.callbacks = event.callbacks, None
+    for callback in callbacks:
+        callback(event)
+
+
+def stop(event):
+    raise StopRun
+
+
+class Event:
+    __slots__ = ('env', 'callbacks', 'value', 'triggered')
+
+    def __init__(self, env):
+        self.env = env
+        self.callbacks = []  #None una vez procesado
+        self.value = None
+        self.triggered = False
+
+    def succeed(self, value=None):
+        if self.triggered:
+            raise RuntimeError(f'{self} ya fue disparado')
+        self.triggered = True
+        self.value = value
+        self.env.push(0.0, NORMAL, fire, self)
+        return self
+
+    @property
+    def processed(self):
+        return self.callbacks is None
+
+
+class Timeout(Event):
+    __slots__ = ()
+
+    def __init__(self, env, delay, value=None):
+        if delay < 0:
+            raise ValueError(f'retraso negativo: {delay}')
+        self.env = env
+        self.callbacks = []
+        self.value = value
+        self.triggered = True
+        env.push(delay, NORMAL, fire, self)
+
+
+class Process(Event):
+    """Corre un generador que hace 'yield' de eventos, igual que un proceso de SimPy."""
+
+    __slots__ = ('generator',)
+
+    def __init__(self, env, generator):
+        super().__init__(env)
+        self.generator = generator
+        env.push(0.0, URGENT, self.resume, None)  #arranca antes que los eventos normales del mismo instante
+
+    def resume(self, event):
+        value = None if event is None else event.value
+        while True:
+            try:
+                target = self.generator.send(value)
+            except StopIteration as done:
+                self.succeed(done.value)
+                return
+            if target.callbacks is not None:
+                target.callbacks.append(self.resume)
+                return
+            value = target.value  #el evento ya se proceso: se continua sin esperar
+
+
+class Engine:
+    """Reemplazo de simpy.Environment sobre un heap de entradas (tiempo, prioridad, seq, callback, arg)."""
+
+    def __init__(self, initial_time=0.0):
+        self.now = initial_time
+        self.queue = []
+        self.seq = 0
+        self.processed = 0  #entradas atendidas, para medir eventos por segundo
+
+    def push(self, delay, priority, callback, arg):
+        self.seq += 1
+        heappush(self.queue, (self.now + delay, priority, self.seq, callback, arg))
+
+    def call_later(self, delay, callback, arg):
+        """Programa callback(arg) dentro de 'delay' sin crear un evento (lo que cuesta lo mismo que un Timeout)."""
+        self.seq += 1
+        heappush(self.queue, (self.now + delay, NORMAL, self.seq, callback, arg))
+
+    def timeout(self, delay, value=None):
+        return Timeout(self, delay, value)
+
+    def event(self):
+        return Event(self)
+
+    def process(self, generator):
+        return Process(self, generator)
+
+    def peek(self):
+        return self.queue[0][0] if self.queue else math.inf
+
+    def queue_depth(self):
+        """Entradas programadas que aun no se atienden."""
+        return len(self.queue)
+
+    def step(self):
+        self.now, _, _, callback, arg = heappop(self.queue)
+        self.processed += 1
+        callback(arg)
+
+    def run(self, until=None):
+        queue = self.queue
+        if until is not None:
+            if until <= self.now:
+                raise ValueError(f'until ({until}) debe ser mayor que el tiempo actual')
+            self.push(until - self.now, URGENT, stop, None)
+        try:
+            while queue:
+                self.now, _, _, callback, arg = heappop(queue)
+                self.processed += 1
+                callback(arg)
+        except StopRun:
+            self.processed -= 1  #la marca de 'until' no cuenta como evento
+
+
+class CalendarEngine(Engine):
+    """
+    Engine con cola de calendario: una casilla por tiempo (dos colas FIFO, URGENT y NORMAL) y un heap
+    solo con los tiempos que tienen casilla. Programar en un tiempo que ya tiene casilla es un append O(1);
+    el heap solo crece con tiempos nuevos. La llave es el tiempo exacto (no redondeado), asi el orden
+    es identico al del heap de Engine y al de SimPy, tambien con jitter.
+    """
+
+    def __init__(self, initial_time=0.0):
+        super().__init__(initial_time)
+        self.slots = {}  #tiempo -> (urgentes, normales)
+        self.times = []  #heap de tiempos con casilla
+
+    def push(self, delay, priority, callback, arg):
+        time = self.now + delay
+        slot = self.slots.get(time)
+        if slot is None:
+            slot = self.slots[time] = (deque(), deque())
+            heappush(self.times, time)
+        slot[priority].append((callback, arg))
+
+    def call_later(self, delay, callback, arg):
+        time = self.now + delay
+        slot = self.slots.get(time)
+        if slot is None:
+            slot = self.slots[time] = (deque(), deque())
+            heappush(self.times, time)
+        slot[NORMAL].append((callback, arg))
+
+    def peek(self):
+        return self.times[0] if self.times else math.inf
+
+    def queue_depth(self):
+        """Entradas programadas que aun no se atienden (recorre las casillas: solo para medir)."""
+        return sum(len(urgent) + len(normal) for urgent, normal in self.slots.values())
+
+    def close_slot(self, time):
+        del self.slots[time]
+        heappop(self.times)
+
+    def step(self):
+        time = self.times[0]
+        urgent, normal = self.slots[time]
+        self.now = time
+        callback, arg = urgent.popleft() if urgent else normal.popleft()
+        if not urgent and not normal:
+            self.close_slot(time)  #antes del callback: lo que programe para este instante abre otra casilla
+        self.processed += 1
+        callback(arg)
+
+    def run(self, until=None):
+        slots, times = self.slots, self.times
+        if until is not None:
+            if until <= self.now:
+                raise ValueError(f'until ({until}) debe ser mayor que el tiempo actual')
+            self.push(until - self.now, URGENT, stop, None)
+        try:
+            while times:
+                time = self.now = times[0]
+                urgent, normal = slots[time]
+                #la casilla sigue abierta mientras se vacia: lo programado para este mismo instante se
+                #agrega a ella, y un URGENT nuevo pasa antes que los NORMAL que faltan
+                while urgent or normal:
+                    callback, arg = urgent.popleft() if urgent else normal.popleft()
+                    self.processed += 1
+                    callback(arg)
+                self.close_slot(time)
+        except StopRun:
+            self.processed -= 1
+            urgent, normal = slots[self.now]
+            if not urgent and not normal:
+                self.close_slot(self.now)
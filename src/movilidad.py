@@ -0,0 +1,129 @@
+import math
+
+import numpy as np
+
+'''
+Movilidad de los nodos. Los modelos mueven todas las posiciones de la Topology de una vez con NumPy
+(el arreglo es el mismo que leen Node.x/Node.y), y MobilityManager, un solo proceso para toda la red,
+avanza un paso cada 'step' segundos y actualiza la adyacencia de forma incremental (Topology.update).
+'''
+
+
+class RandomWaypoint:
+    """
+    Cada nodo elige un punto al azar del area y una velocidad uniforme en [speed_min, speed_max],
+    va en linea recta hasta el punto, espera 'pause' segundos y elige otro.
+    """
+
+    def __init__(self, area_size, speed_min=1.0, speed_max=5.0, pause=2.0):
+        self.area_size = area_size
+        self.speed_min = speed_min
+        self.speed_max = speed_max
+        self.pause = pause
+        self.targets = None
+        self.speeds = None
+        self.resume = None  #tiempo en que cada nodo termina su pausa
+
+    def start(self, positions, rng):
+        n = len(positions)
+        self.targets = rng.uniform(0, self.area_size, (n, 2))
+        self.speeds = rng.uniform(self.speed_min, self.speed_max, n)
+        self.resume = np.zeros(n)
+
+    def move(self, positions, now, dt, rng):
+        walking = self.resume <= now
+        heading = self.targets - positions
+        distance = np.hypot(heading[:, 0], heading[:, 1])
+        advance = self.speeds * dt
+        arrived = walking & (distance <= advance)
+        going = walking & ~arrived
+        positions[going] += heading[going] * (advance[going] / distance[going])[:, None]
+
+        if arrived.any():
+            #llegan, se detienen 'pause' segundos y ya tienen elegido el siguiente punto
+            count = int(arrived.sum())
+            positions[arrived] = self.targets[arrived]
+            self.resume[arrived] = now + self.pause
+            self.targets[arrived] = rng.uniform(0, self.area_size, (count, 2))
+            self.speeds[arrived] = rng.uniform(self.speed_min, self.speed_max, count)
+
+
+class GaussMarkov:
+    """
+    Velocidad y direccion con memoria: en cada paso
+        s = alpha * s + (1 - alpha) * mean_speed + sqrt(1 - alpha^2) * N(0, speed_std)
+    y lo mismo para la direccion, cuya media apunta hacia el centro cuando el nodo se acerca al borde.
+    alpha = 1 es movimiento en linea recta, alpha = 0 es una caminata aleatoria.
+    """
+
+    def __init__(self, area_size, alpha=0.75, mean_speed=3.0, speed_std=1.0, direction_std=0.5, margin=None):
+        self.area_size = area_size
+        self.alpha = alpha
+        self.mean_speed = mean_speed
+        self.speed_std = speed_std
+        self.direction_std = direction_std
+        self.margin = area_size * 0.1 if margin is None else margin  #franja junto al borde que hace girar al nodo
+        self.speeds = None
+        self.directions = None
+        self.mean_directions = None
+
+    def start(self, positions, rng):
+        n = len(positions)
+        self.speeds = np.full(n, self.mean_speed)
+        self.directions = rng.uniform(0, 2 * math.pi, n)
+        self.mean_directions = self.directions.copy()
+
+    def move(self, positions, now, dt, rng):
+        n = len(positions)
+        alpha = self.alpha
+        noise = math.sqrt(1 - alpha * alpha)
+
+        #cerca del borde la direccion media apunta al centro del area
+        center = self.area_size / 2
+        near_edge = ((positions < self.margin) | (positions > self.area_size - self.margin)).any(axis=1)
+        self.mean_directions[near_edge] = np.arctan2(center - positions[near_edge, 1], center - positions[near_edge, 0])
+
+        self.speeds = (alpha * self.speeds + (1 - alpha) * self.mean_speed
+                       + noise * rng.normal(0, self.speed_std, n))
+        np.maximum(self.speeds, 0, out=self.speeds)
+        self.directions = (alpha * self.directions + (1 - alpha) * self.mean_directions
+                           + noise * rng.normal(0, self.direction_std, n))
+
+        positions[:, 0] += self.speeds * dt * np.cos(self.directions)
+        positions[:, 1] += self.speeds * dt * np.sin(self.directions)
+        np.clip(positions, 0, self.area_size, out=positions)
+
+
+class MobilityManager:
+    """
+    Un proceso para toda la red: cada 'step' segundos mueve todas las posiciones con 'model',
+    actualiza la adyacencia de la Topology y reapunta las vistas de vecinos de cada nodo.
+    """
+
+    def __init__(self, env, nodes, model, step=1.0, rng=None):
+        self.env = env
+        self.nodes = nodes
+        self.topology = nodes[0].topology
+        self.model = model
+        self.step = step
+        if rng is None:
+            #sin generador propio se deriva uno del de la red (random.Random de setup_network), asi la misma
+            #semilla de la red repite tambien el movimiento
+            network_rng = nodes[0].rng
+            if network_rng is None:
+                raise ValueError('los nodos no tienen generador de la red: pasa rng=numpy.random.Generator')
+            rng = np.random.default_rng(network_rng.getrandbits(64))
+        self.rng = rng  #numpy.random.Generator
+        self.changed = 0  #nodos cuyos vecinos cambiaron, acumulado
+        model.start(self.topology.positions, self.rng)
+        self.env.process(self.run())
+
+    def run(self):
+        while True:
+            yield self.env.timeout(self.step)
+            self.model.move(self.topology.positions, self.env.now, self.step, self.rng)
+            changed = np.zeros(len(self.nodes), dtype=bool)
+            changed[self.topology.update()] = True
+            self.changed += int(changed.sum())
+            for node, moved in zip(self.nodes, changed.tolist()):
+                node.follow_topology(moved)
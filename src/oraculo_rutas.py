@@ -0,0 +1,127 @@
+import math
+
+import numpy as np
+
+from inundacion import flood_trees, UNREACHED
+from tabla_rutas import NO_ROUTE
+
+'''
+Oraculo de rutas: distancias en saltos de todos los pares por BFS sobre la topologia, para revisar de
+forma independiente las rutas que deja AODV. Los BFS de un lote de origenes corren juntos por niveles
+(inundacion.flood_trees) y cada lote da una matriz int16 de distancias (origen, nodo) y el arbol de caminos
+mas cortos hacia cada origen. Con 10k nodos la matriz completa serian 200 MB, asi que todo se recorre
+por lotes de BATCH_SIZE origenes: el lote mas grande vive en memoria y se suelta antes del siguiente.
+'''
+
+BATCH_SIZE = 256  #origenes por lote: 2 bytes * BATCH_SIZE * n de distancias, mas los arreglos de flood_trees
+
+
+def hop_distances(topology, sources=None, batch_size=BATCH_SIZE):
+    """
+    Genera (origenes, distancias, padres) por lote. 'distancias' es int16 (lote, n), UNREACHED si no hay camino;
+    'padres' es el arbol BFS de cada origen: padres[k, v] es el siguiente salto de v hacia origenes[k].
+    """
+    sources = np.arange(topology.num_nodes) if sources is None else np.asarray(sources)
+    for start in range(0, len(sources), batch_size):
+        batch = sources[start:start + batch_size]
+        parent, hops, _ = flood_trees(topology, batch)
+        yield batch, hops.astype(np.int16), parent
+
+
+def all_pairs(topology, batch_size=BATCH_SIZE):
+    """Matriz int16 (n, n) completa de distancias; solo para redes chicas (n * n * 2 bytes)."""
+    return np.vstack([dist for _, dist, _ in hop_distances(topology, batch_size=batch_size)])
+
+
+def shortest_path(topology, source, dest):
+    """
+    Un camino mas corto de 'source' a 'dest' (lista de ids), o [] si no hay. Es el que encuentra una
+    inundacion de RREQ sin perdidas: el RREP regresa por las rutas inversas del arbol de 'source'.
+    """
+    parent, hops, _ = flood_trees(topology, [source])
+    parent, hops = parent[0], hops[0]
+    if hops[dest] == UNREACHED:
+        return []
+    path = [dest]
+    while path[-1] != source:
+        path.append(int(parent[path[-1]]))
+    return path[::-1]
+
+
+def compare_routes(routing_store, topology, batch_size=BATCH_SIZE, now=None):
+    """
+    Compara cada ruta valida del RoutingStore (next_hop != NO_ROUTE, y sin caducar si se da 'now') contra la
+    topologia actual. Las rutas se agrupan por destino y cada lote de destinos es un lote de BFS, asi nunca
+    se arma la matriz completa. Regresa un dict con el conteo de cada caso y el estiramiento (saltos de la
+    ruta / saltos del camino mas corto) de las rutas cuyo destino sigue alcanzable.
+    """
+    routes = routing_store.snapshot()
+    valid = routes['next_hop'] != NO_ROUTE
+    if now is not None:
+        valid &= routes['expiry'] > now
+    order = np.argsort(routes['dest'][valid], kind='stable')
+    owner, dest, next_hop, hops = (routes[c][valid][order] for c in ('owner', 'dest', 'next_hop', 'hops'))
+    n = topology.num_nodes
+    edges = topology.edge_keys()
+
+    shortest = np.full(len(owner), UNREACHED, dtype=np.int16)  #distancia del duenio de la ruta al destino
+    via_next = np.full(len(owner), UNREACHED, dtype=np.int16)  #distancia del siguiente salto al destino
+    dests = np.unique(dest)
+    for batch, dist, _ in hop_distances(topology, dests, batch_size):
+        #los destinos del lote son consecutivos en 'dests', y sus rutas tambien en 'dest' (ordenado)
+        lo, hi = np.searchsorted(dest, batch[0], side='left'), np.searchsorted(dest, batch[-1], side='right')
+        row = np.searchsorted(batch, dest[lo:hi])
+        shortest[lo:hi] = dist[row, owner[lo:hi]]
+        via_next[lo:hi] = dist[row, next_hop[lo:hi]]
+
+    linked = np.isin(owner.astype(np.int64) * n + next_hop, edges, assume_unique=False)
+    reachable = shortest > 0
+    stretch = hops[reachable] / shortest[reachable]
+    return {
+        'routes': len(owner),
+        'shortest': int(np.count_nonzero(reachable & (hops == shortest))),
+        'longer': int(np.count_nonzero(reachable & (hops > shortest))),
+        'shorter': int(np.count_nonzero(reachable & (hops < shortest))),  #solo con rutas viejas (la red cambio)
+        'unreachable': int(np.count_nonzero(~reachable)),
+        'next_hop_not_neighbor': int(np.count_nonzero(~linked)),
+        #el siguiente salto esta un salto mas cerca del destino: la ruta sigue un camino mas corto
+        'next_hop_on_shortest': int(np.count_nonzero(reachable & linked & (via_next == shortest - 1))),
+        'stretch_mean': float(stretch.mean()) if len(stretch) else math.nan,
+        'stretch_p95': float(np.percentile(stretch, 95)) if len(stretch) else math.nan,
+        'stretch_max': float(stretch.max()) if len(stretch) else math.nan,
+    }
+
+
+if __name__ == "__main__":
+    import random
+
+    from escenarios import area_for
+    from movilidad import MobilityManager, RandomWaypoint
+    from simulador_aodv import setup_network, ACTIVE_ROUTE_TIMEOUT
+    from trafico import Flow, TrafficGenerator
+
+    def run(num_nodes, flows, duration, mobility=False, **options):
+        area_size = area_for(num_nodes)
+        env, nodes = setup_network(num_nodes, area_size, 35, **options)
+        generator = TrafficGenerator(env, nodes, random.Random(5))
+        generator.add_random_flows(flows, Flow, rate=2.0, start=1.0)
+        if mobility:
+            MobilityManager(env, nodes, RandomWaypoint(area_size, 1.0, 5.0), rng=np.random.default_rng(5))
+        env.run(until=1.0 + duration)
+        return compare_routes(nodes[0].routing_table.store, nodes[0].topology, now=env.now)
+
+    cases = (
+        ('500 nodos', 500, 60, 20.0, {}),
+        ('500 nodos, RREP intermedio', 500, 60, 20.0, {'intermediate_rrep': True}),
+        ('500 nodos, movilidad + RERR', 500, 60, 20.0,
+         {'mobility': True, 'route_timeout': ACTIVE_ROUTE_TIMEOUT, 'detect_link_breaks': True}),
+        ('10k nodos', 10000, 40, 8.0, {}),
+    )
+    for name, num_nodes, flows, duration, options in cases:
+        report = run(num_nodes, flows, duration, **options)
+        print(f"{name}: {report['routes']} rutas, {report['shortest']} mas cortas, {report['longer']} mas largas, "
+              f"{report['shorter']} mas cortas que el BFS, {report['unreachable']} a destinos inalcanzables, "
+              f"{report['next_hop_not_neighbor']} con siguiente salto fuera de alcance")
+        print(f"    siguiente salto en un camino mas corto: {report['next_hop_on_shortest']}, "
+              f"estiramiento medio {report['stretch_mean']:.3f}, p95 {report['stretch_p95']:.3f}, "
+              f"max {report['stretch_max']:.3f}")
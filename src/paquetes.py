@@ -0,0 +1,109 @@
+import math
+from enum import IntEnum
+
+
+class PacketType(IntEnum):
+    """Tipo de paquete como entero, 'Node.receive' despacha sin comparar cadenas."""
+    HELLO = 0
+    RREQ = 1
+    RREP = 2
+    DATA = 3
+    RERR = 4
+
+
+'''
+Paquetes con __slots__: sin diccionario por instancia, cada paquete solo guarda sus campos.
+El tipo es atributo de la clase, no ocupa espacio en cada paquete.
+Un paquete ya enviado no se modifica: un broadcast comparte el mismo objeto entre todos los vecinos
+y quien reenvia crea el suyo con 'forward'.
+'''
+
+
+class HelloPacket:
+    __slots__ = ('src',)
+    type = PacketType.HELLO
+
+    def __init__(self, src):
+        self.src = src
+
+
+class RREQPacket:
+    """
+    {inicio de la ruta, destino final, no. de secuencia (broadcast), no. saltos, ultimo nodo en la ruta, TTL,
+    no. de secuencia del origen, ultimo no. de secuencia conocido del destino, pedir RREP gratuito}
+    """
+    __slots__ = ('src', 'dest', 'bcast_id', 'hop_count', 'last_hop', 'ttl', 'src_seq', 'dest_seq', 'gratuitous')
+    type = PacketType.RREQ
+
+    def __init__(self, src, dest, bcast_id, hop_count, last_hop, ttl=math.inf, src_seq=0, dest_seq=0,
+                 gratuitous=False):
+        self.src = src
+        self.dest = dest
+        self.bcast_id = bcast_id
+        self.hop_count = hop_count
+        self.last_hop = last_hop
+        self.ttl = ttl  #saltos que aun puede recorrer la inundacion (inf: sin limite)
+        self.src_seq = src_seq
+        self.dest_seq = dest_seq  #0: el origen no conoce ninguno
+        self.gratuitous = gratuitous  #si un nodo intermedio responde, avisa tambien al destino
+
+    def copy(self):
+        return RREQPacket(self.src, self.dest, self.bcast_id, self.hop_count, self.last_hop, self.ttl,
+                          self.src_seq, self.dest_seq, self.gratuitous)
+
+    def forward(self, hop_count, last_hop):
+        """Copia del paquete con los campos de salto reescritos y un TTL menos, lista para reenviar."""
+        return RREQPacket(self.src, self.dest, self.bcast_id, hop_count, last_hop, self.ttl - 1,
+                          self.src_seq, self.dest_seq, self.gratuitous)
+
+
+class RREPPacket:
+    """
+    {nodo al que lleva la ruta, destino final (origen del RREQ), no. saltos, ultimo nodo en la ruta,
+    no. de secuencia de 'src', RREP gratuito}
+    """
+    __slots__ = ('src', 'dest', 'hop_count', 'last_hop', 'src_seq', 'gratuitous')
+    type = PacketType.RREP
+
+    def __init__(self, src, dest, hop_count, last_hop, src_seq=0, gratuitous=False):
+        self.src = src
+        self.dest = dest
+        self.hop_count = hop_count
+        self.last_hop = last_hop
+        self.src_seq = src_seq
+        self.gratuitous = gratuitous  #solo instala la ruta en 'dest', no cierra ninguna busqueda
+
+    def copy(self):
+        return RREPPacket(self.src, self.dest, self.hop_count, self.last_hop, self.src_seq, self.gratuitous)
+
+    def forward(self, hop_count, last_hop):
+        return RREPPacket(self.src, self.dest, hop_count, last_hop, self.src_seq, self.gratuitous)
+
+
+class DataPacket:
+    """
+    Paquete de datos; 'payload' es el contenido de la aplicacion y viaja sin copiarse salto a salto.
+    Los paquetes de un flujo de trafico llevan su flujo, no. de secuencia y tiempo de creacion (latencia).
+    'path' (lista de ids o None) solo lo lleva el paquete de prueba: cada nodo que lo toca se agrega.
+    """
+    __slots__ = ('src', 'dest', 'payload', 'flow_id', 'seq', 'created', 'path')
+    type = PacketType.DATA
+
+    def __init__(self, src, dest, payload, flow_id=None, seq=0, created=0.0, path=None):
+        self.src = src
+        self.dest = dest
+        self.payload = payload
+        self.flow_id = flow_id
+        self.seq = seq
+        self.created = created
+        self.path = path
+
+
+class RERRPacket:
+    """{nodo que avisa, ((destino inalcanzable, su no. de secuencia), ...)}"""
+    __slots__ = ('src', 'unreachable')
+    type = PacketType.RERR
+
+    def __init__(self, src, unreachable):
+        self.src = src
+        self.unreachable = unreachable  #tupla: el paquete se comparte entre los precursores sin copiarse
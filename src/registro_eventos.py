@@ -0,0 +1,99 @@
+import csv
+from array import array
+from enum import IntEnum
+
+import numpy as np
+
+'''
+Registro estructurado de eventos de la simulacion.
+En lugar de print() en cada salto, cada evento se agrega como una fila a columnas compactas
+(tiempo, nodo, tipo, origen, destino, saltos, vecino) que se exportan al final para analizarse.
+Con el registro apagado el nodo solo compara un atributo contra None antes de cada evento.
+'''
+
+
+class LogLevel(IntEnum):
+    OFF = 0
+    ROUTES = 1  #inicio/fin de descubrimientos y paquetes DATA de extremo a extremo
+    HOPS = 2  #ademas, cada salto de RREQ, RREP y DATA
+
+
+class EventType(IntEnum):
+    DISCOVERY_START = 0
+    ROUTE_FOUND = 1
+    DATA_SENT = 2
+    DATA_DELIVERED = 3
+    DATA_DROPPED = 4
+    RREQ_FORWARDED = 5
+    RREP_FORWARDED = 6
+    DATA_FORWARDED = 7
+    RREP_SENT = 8
+    RREQ_RETRY = 9  #nuevo RREQ de la misma busqueda con TTL mayor (anillo expansivo)
+    DISCOVERY_FAILED = 10  #se agotaron los reintentos sin RREP
+    LINK_BREAK = 11  #un vecino dejo de mandar HELLO; 'peer' es el vecino y 'hop_count' las rutas perdidas
+    RERR_SENT = 12  #'peer' es el precursor avisado y 'hop_count' cuantos destinos lleva el RERR
+
+
+#mensajes en pantalla (echo), los mismos que imprimia el simulador; los eventos sin formato no se imprimen
+FORMATS = {
+    EventType.DISCOVERY_START: "[{time:0.2f}] Nodo {node} inicia busqueda hacia Nodo {dest}",
+    EventType.ROUTE_FOUND: "[{time:0.2f}] RUTA COMPLETADA! Nodo {node} llego al Nodo {src} en {hop_count} saltos.",
+    EventType.DATA_SENT: "[{time:0.2f}] [DATOS] Nodo {node} inicia transmision de DATOS. Siguiente salto: Nodo {peer}",
+    EventType.DATA_FORWARDED: "[{time:0.2f}] [DATOS] Nodo {node} reenvia paquete de DATOS hacia Nodo {peer}",
+    EventType.DATA_DELIVERED: "[{time:0.2f}] EXITO DE TRANSMISION! Nodo {node} recibio el paquete de DATOS.",
+    EventType.RREQ_RETRY: "[{time:0.2f}] Nodo {node} repite busqueda hacia Nodo {dest} con TTL {hop_count}",
+    EventType.DISCOVERY_FAILED: "[{time:0.2f}] Nodo {node} no encontro ruta hacia Nodo {dest}",
+    EventType.LINK_BREAK: "[{time:0.2f}] Nodo {node} perdio el enlace con Nodo {peer} ({hop_count} rutas invalidas)",
+}
+
+COLUMNS = ('time', 'node', 'event', 'src', 'dest', 'hop_count', 'peer')
+NO_PEER = -1
+
+
+class EventLog:
+    """Columnas de eventos en memoria; 'echo' ademas imprime los eventos con formato conocido."""
+
+    def __init__(self, level=LogLevel.ROUTES, echo=False):
+        self.level = level
+        self.echo = echo
+        self.time = array('d')
+        self.node = array('i')
+        self.event = array('b')
+        self.src = array('i')
+        self.dest = array('i')
+        self.hop_count = array('i')
+        self.peer = array('i')  #siguiente salto al enviar, o NO_PEER
+
+    def record(self, time, node, event, src, dest, hop_count=0, peer=NO_PEER):
+        self.time.append(time)
+        self.node.append(node)
+        self.event.append(event)
+        self.src.append(src)
+        self.dest.append(dest)
+        self.hop_count.append(hop_count)
+        self.peer.append(peer)
+        if self.echo and event in FORMATS:
+            print(FORMATS[event].format(time=time, node=node, src=src, dest=dest, hop_count=hop_count, peer=peer))
+
+    def __len__(self):
+        return len(self.time)
+
+    def as_arrays(self):
+        """
+        Copia NumPy de cada columna. No son vistas: mientras una vista exporta el buffer de un array este no
+        puede crecer, y el siguiente 'record' fallaria; con copias el registro se puede revisar entre env.run.
+        """
+        return {name: np.frombuffer(getattr(self, name), dtype=getattr(self, name).typecode).copy()
+                for name in COLUMNS}
+
+    def export_csv(self, path):
+        """Un evento por renglon, con el nombre del tipo de evento."""
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            for row in zip(self.time, self.node, self.event, self.src, self.dest, self.hop_count, self.peer):
+                writer.writerow((row[0], row[1], EventType(row[2]).name) + row[3:])
+
+    def export_npz(self, path):
+        """Archivo binario columnar (una columna por arreglo), se carga con numpy.load."""
+        np.savez(path, **self.as_arrays())
@@ -2,25 +2,134 @@ import simpy
 import random
 import math
 
+import numpy as np
+
+from topologia import Topology
+from paquetes import PacketType, HelloPacket, RREQPacket, RREPPacket, DataPacket, RERRPacket
+from tabla_rutas import RoutingStore, NO_ROUTE, UNKNOWN_SEQ
+from cache_duplicados import DuplicateCache
+from registro_eventos import EventLog, EventType, LogLevel
+
+HELLO_INTERVAL = 2.0  #periodo de los mensajes HELLO
+LINK_DELAY = 0.05  #retraso minimo de transmision por salto
+NET_DIAMETER = 35  #saltos maximos esperados entre dos nodos (valor por defecto de AODV)
+NET_TRAVERSAL_TIME = 2 * LINK_DELAY * NET_DIAMETER
+PATH_DISCOVERY_TIME = 2 * NET_TRAVERSAL_TIME  #tiempo que se recuerda un RREQ ya visto
+#busqueda en anillo expansivo (RFC 3561, 6.4): el RREQ empieza con TTL corto y crece si no llega RREP
+TTL_START = 1
+TTL_INCREMENT = 2
+TTL_THRESHOLD = 7  #pasando este TTL se inunda con NET_DIAMETER
+TIMEOUT_BUFFER = 2
+RREQ_RETRIES = 2  #reintentos con TTL = NET_DIAMETER antes de declarar el destino inalcanzable
+#vida de las rutas (solo si la red se crea con 'route_timeout'; si no, las rutas no caducan)
+ACTIVE_ROUTE_TIMEOUT = 3.0  #una ruta que no se usa en este tiempo caduca
+ALLOWED_HELLO_LOSS = 2  #HELLO perdidos antes de dar por caida la ruta a un vecino (y el enlace, si se vigila)
+BROADCAST_JITTER = 0.01  #retraso extra maximo sugerido para cada broadcast (ver 'broadcast_jitter')
+DELETE_PERIOD = 5 * max(ACTIVE_ROUTE_TIMEOUT, HELLO_INTERVAL)  #tiempo que se guarda una ruta invalida (su no. de secuencia)
+DATA_BUFFER_SIZE = 64  #paquetes DATA retenidos por busqueda en curso; los que no caben se descartan
+
+
+def ring_traversal_time(ttl):
+    """Espera por el RREP de un anillo de 'ttl' saltos."""
+    return 2 * LINK_DELAY * (ttl + TIMEOUT_BUFFER)
+
+
+class Discovery:
+    """
+    Busqueda de ruta en curso de un nodo hacia 'dest'. Todos los que piden la misma ruta esperan el mismo
+    'event' (su valor es True si llego el RREP) y los DATA para 'dest' se retienen en 'buffer' mientras tanto.
+    """
+    __slots__ = ('dest', 'event', 'ttl', 'retries', 'bcast_id', 'buffer')
+
+    def __init__(self, env, dest, ttl):
+        self.dest = dest
+        self.event = env.event()
+        self.ttl = ttl
+        self.retries = 0
+        self.bcast_id = None  #RREQ del intento actual
+        self.buffer = []
+
 
 class Node:
-    def __init__(self, env, node_id, x, y, coverage_radius):
+    def __init__(self, env, node_id, x, y, coverage_radius, start_hello=True, fast_delivery=True, routing_store=None,
+                 expanding_ring=False, intermediate_rrep=False, gratuitous_rrep=False, route_timeout=None,
+                 detect_link_breaks=False, hello_phase=0.0, broadcast_jitter=0.0, rng=None, reachability_check=False,
+                 topology=None):
+        if broadcast_jitter and rng is None:
+            raise ValueError('broadcast_jitter necesita el generador de la corrida: pasa rng=random.Random')
+        if reachability_check and topology is None:
+            raise ValueError('reachability_check necesita la topologia de la red: pasa topology=Topology')
         self.env = env
+        self.fast_delivery = fast_delivery  #True: entrega con un Timeout + callback; False: un proceso 'transmit' por salto
+        #motor_eventos.Engine programa callback(arg) sin crear un evento; simpy.Environment no lo tiene
+        self.call_later = getattr(env, 'call_later', None) if fast_delivery else None
+        self.expanding_ring = expanding_ring  #True: RREQ con TTL creciente; False: una sola inundacion sin limite
+        self.intermediate_rrep = intermediate_rrep  #True: un nodo con ruta fresca al destino responde por el
+        self.gratuitous_rrep = gratuitous_rrep  #True: los RREQ propios piden RREP gratuito al destino
+        self.route_timeout = route_timeout  #vida de una ruta activa desde su ultimo uso (None: no caducan)
+        self.detect_link_breaks = detect_link_breaks  #True: vigila los HELLO de cada vecino y avisa con RERR
+        self.hello_phase = hello_phase  #desfase del primer HELLO (hello_worker), para no emitir todos a la vez
+        self.broadcast_jitter = broadcast_jitter  #retraso extra maximo de cada broadcast, sorteado con 'rng'
+        self.rng = rng  #generador de la corrida (random.Random), solo se usa si hay jitter
+        #True: si la topologia dice que el destino esta en otra componente conexa, la busqueda falla sin inundar
+        self.reachability_check = reachability_check
         self.node_id = node_id
-        self.x = x
-        self.y = y
+        self.position = np.array([x, y], dtype=np.float64)  #al enlazar una Topology pasa a ser una vista de su arreglo de posiciones
         self.coverage_radius = coverage_radius
-        self.neighbors = []  #lista de vecinos propios
+        self.topology = None
+        if topology is not None:
+            self.bind_topology(topology)
+        self.neighbors = []  #lista de vecinos propios (o NeighborView sobre la fila CSR)
+        self.neighbor_map = None  #node_id -> Node, se arma al primer unicast (ver get_neighbor)
 
         #estructuras AODV
-        self.routing_table = {}  #dest_id -> {'next_hop': id, 'hops': n}
+        #dest_id -> {'next_hop': id, 'hops': n}, vista sobre las columnas del RoutingStore de la red
+        if routing_store is None:
+            routing_store = RoutingStore()  #nodo suelto: columnas propias
+        self.routing_table = routing_store.table(node_id)
         self.broadcast_id = 0
-        self.seen_rreqs = set()  #(origen_id, bcast_id). Conjunto de tuplas para almacenar el historial de mensajes RREQ enviados
-
-        #iniciar el proceso de mensajes HELLO
-        self.env.process(self.hello_worker())
+        self.seq_no = 1  #no. de secuencia propio, crece con cada RREQ que origina
+        self.on_route_found = self.send_demo_data  #que hacer al llegar el RREP al origen (None: nada)
+        self.data_sink = None  #si se asigna, recibe cada paquete DATA que llega a su destino (trafico.TrafficStats)
+        #registro de eventos por nivel; None = apagado, el costo es solo comparar contra None
+        self.log_routes = None
+        self.log_hops = None
+        #(origen_id, bcast_id). Historial de mensajes RREQ vistos, cada entrada caduca tras PATH_DISCOVERY_TIME
+        self.seen_rreqs = DuplicateCache(env, PATH_DISCOVERY_TIME)
+        #dest_id -> Discovery: busquedas propias en espera de RREP, una por destino
+        self.pending = {}
+        #vecino_id -> ultimo HELLO recibido (solo con detect_link_breaks)
+        self.last_heard = {}
+        #dest_id -> {vecinos que nos usan como siguiente salto hacia dest_id}: a quienes avisar con RERR
+        #(solo con detect_link_breaks; se sueltan con el RERR o cuando se borra la ruta, ver drop_precursors)
+        self.precursors = {}
+        self.radio_neighbors = None  #vecinos guardados mientras el nodo esta apagado (ver power_off)
+
+        #iniciar el proceso de mensajes HELLO (si no lo maneja un HelloScheduler de toda la red)
+        if start_hello:
+            self.env.process(self.hello_worker())
+
+    @property
+    def x(self):
+        return self.position[0]
+
+    @property
+    def y(self):
+        return self.position[1]
+
+    def bind_topology(self, topology):
+        """Usa la fila 'node_id' del arreglo contiguo de posiciones de la topologia."""
+        self.topology = topology
+        self.position = topology.positions[self.node_id]
 
     def calculate_neighbors(self, all_nodes):
+        self.neighbor_map = None  #cualquier cambio de vecinos invalida el mapa de ids
+
+        if self.topology is not None:
+            #la adyacencia ya esta calculada en CSR, solo se toma una vista
+            self.neighbors = self.topology.neighbor_view(self.node_id, all_nodes)
+            return
+
         self.neighbors = []
         for other_node in all_nodes:
             if self.node_id != other_node.node_id:
@@ -28,200 +137,598 @@ class Node:
                 if dist <= self.coverage_radius:  #lo que este dentro del radio de cobertura, se guarda como un vecino
                     self.neighbors.append(other_node)
 
+    def follow_topology(self, changed):
+        """
+        Despues de 'Topology.update' (nodos en movimiento): apunta la vista de vecinos a la fila nueva del CSR,
+        tambien si el nodo esta apagado. El mapa de ids solo se descarta si sus vecinos cambiaron.
+        """
+        view = self.neighbors if self.radio_neighbors is None else self.radio_neighbors
+        view.ids = self.topology.neighbor_ids(self.node_id)
+        if changed:
+            self.neighbor_map = None
+
+    def set_event_log(self, event_log):
+        """Conecta el EventLog de la red segun su nivel (None lo apaga)."""
+        level = event_log.level if event_log is not None else LogLevel.OFF
+        self.log_routes = event_log if level >= LogLevel.ROUTES else None
+        self.log_hops = event_log if level >= LogLevel.HOPS else None
+
+    def get_neighbor(self, node_id):
+        """
+        Regresa el vecino con id 'node_id' o None si no esta en rango, en O(1).
+        El mapa se arma la primera vez que se necesita (solo los nodos que reenvian unicast lo pagan)
+        y se descarta cada vez que se recalculan los vecinos.
+        """
+        if self.neighbor_map is None:
+            self.neighbor_map = {n.node_id: n for n in self.neighbors}
+        return self.neighbor_map.get(node_id)
+
     #=================================================================================
     #mensajes HELLO
     def hello_worker(self):
         """
         Envia un mensaje HELLO cada 2 segundos para avisar que aun esta vivo.
-        Este proceso inicia en un t0, al inicializar los nodos.
+        Este proceso inicia en un t0, al inicializar los nodos (mas 'hello_phase').
         """
+        if self.hello_phase:
+            yield self.env.timeout(self.hello_phase)
         while True:
-            packet = {'type': 'HELLO', 'src': self.node_id}
+            if self.detect_link_breaks:
+                self.check_links()
+            packet = HelloPacket(self.node_id)
             #SOLO a los vecinos proximos
             for neighbor in self.neighbors:
-                self.env.process(self.transmit(packet, neighbor))
+                self.send(packet, neighbor)
 
-            yield self.env.timeout(2.0)  #ponemos a dormir y despertamos en 2 segundos simulados para volver a mandarlo
+            yield self.env.timeout(HELLO_INTERVAL)  #ponemos a dormir y despertamos en 2 segundos simulados para volver a mandarlo
 
     # =================================================================================
 
     def broadcast(self, packet):
-        for neighbor in self.neighbors:
-            self.env.process(self.transmit(packet.copy(), neighbor))
+        #todos los vecinos reciben el mismo objeto: un paquete ya enviado no se modifica,
+        #quien lo reenvia crea el suyo con 'forward' (una copia por nodo, no una por arista)
+        if self.broadcast_jitter:
+            #una transmision llega a todos los vecinos a la vez: el retraso extra se sortea una vez por broadcast
+            delay = LINK_DELAY + self.rng.uniform(0, self.broadcast_jitter)
+            for neighbor in self.neighbors:
+                self.send(packet, neighbor, delay)
+        else:
+            for neighbor in self.neighbors:
+                self.send(packet, neighbor)
+
+    def send(self, packet, receiver, delay=LINK_DELAY):
+        """Entrega 'packet' a 'receiver' despues de 'delay' (LINK_DELAY salvo jitter)."""
+        if self.call_later is not None:
+            self.call_later(delay, receiver.receive, packet)  #misma posicion en la cola que el Timeout, sin objeto evento
+        elif self.fast_delivery:
+            #un Timeout simple que lleva el paquete como valor, sin crear un Process ni un generador
+            self.env.timeout(delay, packet).callbacks.append(receiver.on_delivery)
+        else:
+            self.env.process(self.transmit(packet, receiver, delay))
 
-    def transmit(self, packet, receiver):
-        yield self.env.timeout(0.05)  #simulamos un retraso minimo de transmision de 50ms
+    def on_delivery(self, event):
+        self.receive(event.value)
+
+    def transmit(self, packet, receiver, delay=LINK_DELAY):
+        yield self.env.timeout(delay)  #simulamos un retraso minimo de transmision de 50ms
         receiver.receive(packet)
 
     def receive(self, packet):
-        if packet['type'] == 'RREQ':
-            self.handle_rreq(packet)
-        elif packet['type'] == 'RREP':
-            self.handle_rrep(packet)
-        elif packet['type'] == 'HELLO':
-            #si recibo un HELLO, ese nodo esta a 1 salto, es vecino y actualizamos tabla
-            if packet['src'] not in self.routing_table:
-                self.routing_table[packet['src']] = {'next_hop': packet['src'], 'hops': 1}
-        elif packet['type'] == 'DATA':
-            self.handle_data(packet)
+        self.dispatch[packet.type](self, packet)  #tabla de despacho por tipo entero (ver al final de la clase)
+
+    def handle_hello(self, packet):
+        #si recibo un HELLO, ese nodo esta a 1 salto, es vecino y actualizamos tabla
+        if self.detect_link_breaks:
+            self.last_heard[packet.src] = self.env.now
+        next_hop = self.routing_table.next_hop(packet.src)
+        if next_hop is None or next_hop == NO_ROUTE:
+            #ruta nueva, o la que se invalido al perder el enlace (conserva su no. de secuencia)
+            self.routing_table.set_route(packet.src, packet.src, 1,
+                                         expiry=self.route_expiry(ALLOWED_HELLO_LOSS * HELLO_INTERVAL))
+        elif self.route_timeout is not None:
+            #cada HELLO extiende la ruta al vecino; si dejan de llegar, caduca sola
+            self.routing_table.refresh(packet.src, self.env.now + ALLOWED_HELLO_LOSS * HELLO_INTERVAL)
+
+    #=================================================================================
+    #mantenimiento de rutas: enlaces caidos y RERR
+    def check_links(self):
+        """Da por caido el enlace con cada vecino del que no llega un HELLO en ALLOWED_HELLO_LOSS intervalos."""
+        deadline = self.env.now - ALLOWED_HELLO_LOSS * HELLO_INTERVAL
+        silent = [neighbor_id for neighbor_id, heard in self.last_heard.items() if heard < deadline]
+        for neighbor_id in silent:
+            del self.last_heard[neighbor_id]
+            self.handle_link_break(neighbor_id)
+
+    def handle_link_break(self, neighbor_id):
+        """Invalida las rutas que usaban a 'neighbor_id' y avisa a sus precursores (RFC 3561, 6.11)."""
+        table = self.routing_table
+        expiry = self.route_expiry(DELETE_PERIOD)
+        lost = tuple((dest, table.invalidate(dest, expiry=expiry)) for dest in table.dests_via(neighbor_id))
+        if self.log_routes is not None:
+            self.log_routes.record(self.env.now, self.node_id, EventType.LINK_BREAK, self.node_id, neighbor_id,
+                                   len(lost), neighbor_id)
+        if lost:
+            self.send_rerr(lost)
+
+    def add_precursor(self, dest_id, neighbor_id):
+        precursors = self.precursors.get(dest_id)
+        if precursors is None:
+            self.precursors[dest_id] = {neighbor_id}
+        else:
+            precursors.add(neighbor_id)
+
+    def drop_precursors(self, dest_id):
+        """La ruta hacia 'dest_id' se borro (caduco): ya nadie la usa a traves de este nodo."""
+        self.precursors.pop(dest_id, None)
+
+    def send_rerr(self, lost):
+        """Un RERR con todos los destinos de 'lost' a cada precursor de alguno de ellos."""
+        targets = set()
+        for dest, _ in lost:
+            targets.update(self.precursors.pop(dest, ()))
+        if not targets:
+            return
+        packet = RERRPacket(self.node_id, lost)
+        for target in sorted(targets):
+            target_node = self.get_neighbor(target)
+            if target_node:
+                if self.log_hops is not None:
+                    self.log_hops.record(self.env.now, self.node_id, EventType.RERR_SENT, self.node_id, lost[0][0],
+                                         len(lost), target)
+                self.send(packet, target_node)
+
+    def handle_rerr(self, packet):
+        #solo importan los destinos a los que este nodo llegaba a traves de quien manda el RERR
+        table = self.routing_table
+        expiry = self.route_expiry(DELETE_PERIOD)
+        lost = tuple((dest, table.invalidate(dest, seq_no, expiry)) for dest, seq_no in packet.unreachable
+                     if table.next_hop(dest) == packet.src)
+        if lost:
+            self.send_rerr(lost)
+
+    def power_off(self):
+        """
+        Apaga el nodo (falla o bateria): sin vecinos alcanzables no envia nada, ni HELLO,
+        y lo que le sigue llegando de sus vecinos se ignora. Sus vecinos solo lo notan por los HELLO perdidos.
+        La topologia no se entera: el union-find de reachability_check no cambia, asi que un puente apagado
+        sigue dando por alcanzable al destino y la busqueda inunda hasta fallar por tiempo.
+        """
+        if self.radio_neighbors is None:
+            self.radio_neighbors = self.neighbors
+            self.neighbors = []
+            self.neighbor_map = None
+            self.dispatch = POWERED_OFF_DISPATCH
+
+    def power_on(self):
+        if self.radio_neighbors is not None:
+            self.neighbors = self.radio_neighbors
+            self.radio_neighbors = None
+            self.neighbor_map = None
+            del self.dispatch  #vuelve la tabla de despacho de la clase
+
+    def route_expiry(self, lifetime):
+        """Tiempo de caducidad para una ruta que vive 'lifetime' desde ahora (None si las rutas no caducan)."""
+        return None if self.route_timeout is None else self.env.now + lifetime
 
     #bpusqueda de ruta
     def initiate_route_discovery(self, dest_id):
+        """
+        Regresa un evento que se dispara con True cuando hay ruta hacia 'dest_id' (False si la busqueda falla).
+        Si ya hay ruta no se inunda nada, y si ya hay una busqueda en curso hacia 'dest_id' se regresa su evento.
+        Con reachability_check, un destino fuera de la componente conexa falla en el acto (sin RREQ ni espera).
+        Una ruta cuyo siguiente salto ya no es vecino se invalida antes del RREQ (RFC 3561, 6.11): su no. de
+        secuencia sube y el RREQ pide una ruta mas nueva que ella, asi la respuesta la puede reemplazar.
+        """
+        if self.has_route(dest_id):
+            return self.env.event().succeed(True)
+        discovery = self.pending.get(dest_id)
+        if discovery is not None:
+            return discovery.event
+        if self.routing_table.next_hop(dest_id) not in (None, NO_ROUTE):
+            self.routing_table.invalidate(dest_id, expiry=self.route_expiry(DELETE_PERIOD))
+        if self.reachability_check and not self.topology.connected_components().connected(self.node_id, dest_id):
+            if self.log_routes is not None:
+                self.log_routes.record(self.env.now, self.node_id, EventType.DISCOVERY_FAILED, self.node_id, dest_id)
+            return self.env.event().succeed(False)
+
+        discovery = self.pending[dest_id] = Discovery(self.env, dest_id, TTL_START if self.expanding_ring else math.inf)
+        if self.log_routes is not None:
+            self.log_routes.record(self.env.now, self.node_id, EventType.DISCOVERY_START, self.node_id, dest_id)
+        self.send_rreq(discovery)
+        return discovery.event
+
+    def has_route(self, dest_id):
+        """Hay ruta hacia 'dest_id' y su siguiente salto sigue siendo vecino."""
+        return self.get_neighbor(self.routing_table.next_hop(dest_id)) is not None
+
+    def send_rreq(self, discovery):
         self.broadcast_id += 1
+        self.seq_no += 1
+        dest_id = discovery.dest
 
         # ------------------------------------------
-        #paquete RREQ: {tipo, inicio de la ruta, destino final, no. de secuencia, no. latos, ultimo nodo en la ruta}
+        #paquete RREQ: {tipo, inicio de la ruta, destino final, no. de secuencia, no. latos, ultimo nodo en la ruta, TTL,
+        #no. de secuencia propio, ultimo no. de secuencia conocido del destino, RREP gratuito}
         #inicializa con 0 saltos
-        packet = {
-            'type': 'RREQ', 'src': self.node_id, 'dest': dest_id,
-            'bcast_id': self.broadcast_id, 'hop_count': 0, 'last_hop': self.node_id
-        }
+        packet = RREQPacket(self.node_id, dest_id, self.broadcast_id, 0, self.node_id, discovery.ttl,
+                            self.seq_no, self.routing_table.seq_no(dest_id), self.gratuitous_rrep)
         # ------------------------------------------
 
-        print(f"[{self.env.now:0.2f}] Nodo {self.node_id} inicia busqueda hacia Nodo {dest_id}")
-        self.seen_rreqs.add((self.node_id, self.broadcast_id))  #se registra el mensaje recibido. Al ser un conjunto, no hay miembros repetidos
-        self.broadcast(packet)  #se manda una copia del mensaje, a los vecinos inmediatos.
+        #si no llega el RREP a tiempo, 'on_rreq_timeout' repite la busqueda con un anillo mas grande o la abandona
+        discovery.bcast_id = self.broadcast_id
+        if not self.expanding_ring:
+            wait = PATH_DISCOVERY_TIME  #una sola inundacion; pasado este tiempo ya no queda ninguna copia viva
+        elif discovery.ttl < NET_DIAMETER:
+            wait = ring_traversal_time(discovery.ttl)
+        else:
+            wait = NET_TRAVERSAL_TIME * 2 ** discovery.retries
+        self.env.timeout(wait, discovery).callbacks.append(self.on_rreq_timeout)
+        self.seen_rreqs.add((self.node_id, self.broadcast_id))  #se registra el mensaje enviado, para ignorar sus copias de regreso
+        self.broadcast(packet)  #se manda el mensaje a los vecinos inmediatos.
+
+    def on_rreq_timeout(self, event):
+        discovery = event.value
+        if self.pending.get(discovery.dest) is not discovery:
+            return  #ya llego el RREP (y quiza empezo otra busqueda hacia el mismo destino)
+        if discovery.ttl >= NET_DIAMETER and (not self.expanding_ring or discovery.retries >= RREQ_RETRIES):
+            if self.log_routes is not None:
+                self.log_routes.record(self.env.now, self.node_id, EventType.DISCOVERY_FAILED, self.node_id,
+                                       discovery.dest)
+            self.finish_discovery(discovery.dest, False)
+            return
+
+        if discovery.ttl < NET_DIAMETER:
+            discovery.ttl += TTL_INCREMENT
+            if discovery.ttl > TTL_THRESHOLD:
+                discovery.ttl = NET_DIAMETER
+        else:
+            discovery.retries += 1  #inundacion completa otra vez, esperando el doble (backoff exponencial binario)
+        if self.log_routes is not None:
+            self.log_routes.record(self.env.now, self.node_id, EventType.RREQ_RETRY, self.node_id, discovery.dest,
+                                   discovery.ttl)
+        self.send_rreq(discovery)
+
+    def finish_discovery(self, dest_id, found):
+        """Cierra la busqueda hacia 'dest_id': envia (o descarta) los DATA retenidos y despierta a quien espera."""
+        discovery = self.pending.pop(dest_id)
+        next_hop = self.routing_table.next_hop(dest_id)
+        target_node = self.get_neighbor(next_hop) if found else None
+        for packet in discovery.buffer:
+            if target_node:
+                self.emit_data(packet, target_node)
+            elif self.log_routes is not None:
+                self.log_routes.record(self.env.now, self.node_id, EventType.DATA_DROPPED, packet.src, packet.dest)
+        discovery.event.succeed(found)
 
     def handle_rreq(self, packet):
-        rreq_id = (packet['src'], packet['bcast_id'])  #obtenemos el id del nodoque envio el mensaje.
+        rreq_id = (packet.src, packet.bcast_id)  #obtenemos el id del nodoque envio el mensaje.
         if rreq_id in self.seen_rreqs: return  #si el mensaje ya ha sido recibido antes, termina.
         self.seen_rreqs.add(rreq_id)  #se aniade al conjunto del historial.
 
         #ruta inversa / reverse route
-        sender = packet['last_hop']
-        hops = packet['hop_count'] + 1
-        if packet['src'] not in self.routing_table or self.routing_table[packet['src']]['hops'] > hops:
-            #registra el nodo que envi el mensaje, para tener memorizado el camino hacia ese nodo
-            self.routing_table[packet['src']] = {'next_hop': sender, 'hops': hops}
+        sender = packet.last_hop
+        hops = packet.hop_count + 1
+        #registra el nodo que envi el mensaje, para tener memorizado el camino hacia ese nodo (si es mas fresco o corto)
+        #la ruta inversa solo tiene que durar lo que tarde en volver el RREP
+        self.routing_table.update_route(packet.src, sender, hops, packet.src_seq, self.route_expiry(NET_TRAVERSAL_TIME))
 
         #si el id actual (el nodo actual) es el DESTION, termina el envio de RREQ e inicia el mensaje de regreso RREP
-        if packet['dest'] == self.node_id:
-            self.send_rrep(packet['src'])
-        else:
-            new_p = packet.copy()
-            new_p['hop_count'] = hops  #se suma 1 la hop_count
-            new_p['last_hop'] = self.node_id  #el ultimo nodo ahora es el actual
+        if packet.dest == self.node_id:
+            if packet.dest_seq > self.seq_no:
+                self.seq_no = packet.dest_seq
+            self.send_rrep(packet.src, self.node_id, 0, self.seq_no)
+        elif self.intermediate_rrep and self.has_fresh_route(packet.dest, packet.dest_seq):
+            self.reply_for_destination(packet, hops)  #la inundacion se detiene aqui
+        elif packet.ttl > 1:  #con TTL 1 el RREQ llega a este nodo pero ya no se reenvia
+            new_p = packet.forward(hops, self.node_id)  #se suma 1 la hop_count y el ultimo nodo ahora es el actual
+            if self.log_hops is not None:
+                self.log_hops.record(self.env.now, self.node_id, EventType.RREQ_FORWARDED, packet.src, packet.dest, hops)
             self.broadcast(new_p)  #lanza broadcast a sus vecinos conel mensaje modificado
 
-    def send_rrep(self, target_src):
+    def has_fresh_route(self, dest_id, dest_seq):
+        """Hay ruta a 'dest_id' con no. de secuencia conocido y al menos tan nuevo como el que pide el RREQ."""
+        seq_no = self.routing_table.seq_no(dest_id)
+        return seq_no != UNKNOWN_SEQ and seq_no >= dest_seq and self.has_route(dest_id)
+
+    def reply_for_destination(self, packet, hops):
+        """RREP de un nodo intermedio con la ruta que ya conoce hacia el destino del RREQ (RFC 3561, 6.6.2)."""
+        table = self.routing_table
+        next_hop = table.next_hop(packet.dest)
+        if self.detect_link_breaks:
+            #quien manda el RREQ usara esta ruta, y el siguiente salto hacia el destino usara la ruta inversa
+            self.add_precursor(packet.dest, packet.last_hop)
+            self.add_precursor(packet.src, next_hop)
+        self.send_rrep(packet.src, packet.dest, table.hops(packet.dest), table.seq_no(packet.dest))
+        if packet.gratuitous:
+            #RREP gratuito: el destino aprende la ruta hacia el origen, 'hops' saltos mas alla de este nodo
+            target_node = self.get_neighbor(next_hop)
+            if target_node:
+                if self.log_hops is not None:
+                    self.log_hops.record(self.env.now, self.node_id, EventType.RREP_SENT, packet.src, packet.dest,
+                                         hops, next_hop)
+                self.send(RREPPacket(packet.src, packet.dest, hops, self.node_id, packet.src_seq, True), target_node)
+
+    def send_rrep(self, target_src, dest_id, hop_count, dest_seq):
         # ------------------------------------------
-        # paquete RREP: {tipo, nodoa ctual, destino final ahora es el orgien del primer RREQ, no. latos, ultimo nodo en la ruta}
-        # inicializa con 0 saltos de regreso
-        packet = {
-            'type': 'RREP', 'src': self.node_id, 'dest': target_src,
-            'hop_count': 0, 'last_hop': self.node_id
-        }
+        # paquete RREP: {tipo, nodo al que lleva la ruta, destino final ahora es el orgien del primer RREQ, no. latos,
+        # ultimo nodo en la ruta, no. de secuencia del destino}
+        # el destino inicializa con 0 saltos de regreso; un nodo intermedio, con sus saltos hacia el destino
+        packet = RREPPacket(dest_id, target_src, hop_count, self.node_id, dest_seq)
         # ------------------------------------------
 
         #revisa la tabla de ruteo hacia el nodo origen del mensaje RREQ para saber que esta un paso
-        next_hop = self.routing_table[target_src]['next_hop']
+        next_hop = self.routing_table.next_hop(target_src)
 
         '''
         Busqueda del vecino a enviar mensaje.
-        Revisa la lista de vecinos 'self.neighbors' uno por uno, cuando se encuentre el vecino inmediato 'next_hop', 
-        guardalo. El next() obtiene el primer resultado encontrado del ciclo. Si 'next_hop' aun esta 'despierto', 
-        regresa el id, si no, es None.
+        Busca el vecino inmediato 'next_hop' en el mapa id -> Node de los vecinos. Si 'next_hop' aun esta 'despierto', 
+        regresa el nodo, si no, es None.
         Si hay elncale a 'next_hop', se transmite el mensaje, si no, se pierde. Esto soluciona el manejo de errores
         que causaba al no 'next_hop'.
         '''
-        target_node = next((n for n in self.neighbors if n.node_id == next_hop), None)
+        target_node = self.get_neighbor(next_hop)
         if target_node:
-            self.env.process(self.transmit(packet, target_node))
+            if self.log_hops is not None:
+                self.log_hops.record(self.env.now, self.node_id, EventType.RREP_SENT, dest_id, target_src, hop_count,
+                                     next_hop)
+            self.send(packet, target_node)
 
     def handle_rrep(self, packet):
-        sender = packet['last_hop']
-        hops = packet['hop_count'] + 1
-        if packet['src'] not in self.routing_table or self.routing_table[packet['src']]['hops'] > hops:
-            #guarda el nodo de quien se recibe el mensaje RREP para tener su tabla de ruteo hacia ese nodo
-            self.routing_table[packet['src']] = {'next_hop': sender, 'hops': hops}
-
-        if packet['dest'] == self.node_id:
-            print(f"[{self.env.now:0.2f}] RUTA COMPLETADA! Nodo {self.node_id} llego al Nodo {packet['src']} en {hops} saltos.")
+        sender = packet.last_hop
+        hops = packet.hop_count + 1
+        #guarda el nodo de quien se recibe el mensaje RREP para tener su tabla de ruteo hacia ese nodo
+        self.routing_table.update_route(packet.src, sender, hops, packet.src_seq, self.route_expiry(self.route_timeout))
+
+        if packet.dest == self.node_id:
+            if packet.gratuitous or packet.src not in self.pending:
+                return  #RREP gratuito, o uno tardio de una busqueda que ya termino: solo se guarda la ruta
+            if not self.has_route(packet.src):
+                return  #la ruta del RREP no quedo en la tabla (habia una mas fresca): la busqueda sigue esperando
+            if self.log_routes is not None:
+                self.log_routes.record(self.env.now, self.node_id, EventType.ROUTE_FOUND, packet.src, packet.dest, hops)
+            self.finish_discovery(packet.src, True)
             #significa que ya conoce la ruta. Envia paquete de datos
-            self.send_data(packet['src'])
+            if self.on_route_found is not None:
+                self.on_route_found(packet.src)
         else:
             #si el nodo actual no es el destino final:
-            new_p = packet.copy()
-            new_p['hop_count'] = hops
-            new_p['last_hop'] = self.node_id
-            next_hop = self.routing_table[packet['dest']]['next_hop']
-            target_node = next((n for n in self.neighbors if n.node_id == next_hop), None)
+            new_p = packet.forward(hops, self.node_id)
+            next_hop = self.routing_table.next_hop(packet.dest)
+            target_node = self.get_neighbor(next_hop)
             if target_node:
-                self.env.process(self.transmit(new_p, target_node))
+                if self.detect_link_breaks:
+                    #precursores: el siguiente salto hacia el origen usa la ruta hacia 'src' y quien manda el RREP,
+                    #la ruta inversa
+                    self.add_precursor(packet.src, next_hop)
+                    self.add_precursor(packet.dest, sender)
+                if self.log_hops is not None:
+                    self.log_hops.record(self.env.now, self.node_id, EventType.RREP_FORWARDED, packet.src, packet.dest,
+                                         hops, next_hop)
+                self.send(new_p, target_node)
 
     # ===============================================
-    def send_data(self, dest_id):
+    def send_data(self, dest_id, payload=None, flow_id=None, seq=0, record_path=False):
         """
-        Enviar un paquete usando la ruta descubierta.
+        Enviar un paquete usando la ruta descubierta; 'payload' viaja intacto, sea lo que sea.
+        Con 'record_path' el paquete lleva la lista de nodos por los que pasa (packet.path).
+        Regresa False si no hay ruta (o el siguiente salto ya no es vecino) y el paquete no sale.
         """
-        #simulacion de un data
-        data_packet = {
-            'type': 'DATA',
-            'src': self.node_id,
-            'dest': dest_id,
-            'payload': {
-                'message': 'Hola desde el nodo origen, validando la ruta calculada.',
-                'path_taken': [self.node_id]  #iniciamos una lista para registrar los nodos que toca, formando el happy path
-            }
-        }
-
         #busca en la tabla de ruteo cual es el primer paso
-        next_hop = self.routing_table[dest_id]['next_hop']
-        target_node = next((n for n in self.neighbors if n.node_id == next_hop), None)
+        next_hop = self.routing_table.next_hop(dest_id)
+        target_node = self.get_neighbor(next_hop)
+        if not target_node:
+            return False
 
-        if target_node:
-            print(f"[{self.env.now:0.2f}] [DATOS] Nodo {self.node_id} inicia transmision de DATOS. Siguiente salto: Nodo {next_hop}")
-            self.env.process(self.transmit(data_packet, target_node))
+        path = [self.node_id] if record_path else None
+        self.emit_data(DataPacket(self.node_id, dest_id, payload, flow_id, seq, self.env.now, path), target_node)
+        return True
+
+    def queue_data(self, dest_id, payload=None, flow_id=None, seq=0):
+        """
+        Como 'send_data', pero sin ruta el paquete se retiene hasta que termine la busqueda hacia 'dest_id'
+        (que se inicia si no hay una en curso). Regresa False si el buffer de esa busqueda esta lleno, o si
+        la busqueda fallo en el acto (reachability_check con el destino en otra componente).
+        """
+        if self.send_data(dest_id, payload, flow_id, seq):
+            return True
+        self.initiate_route_discovery(dest_id)
+        discovery = self.pending.get(dest_id)
+        if discovery is None or len(discovery.buffer) >= DATA_BUFFER_SIZE:
+            return False
+        discovery.buffer.append(DataPacket(self.node_id, dest_id, payload, flow_id, seq, self.env.now))
+        return True
+
+    def emit_data(self, packet, target_node):
+        if self.route_timeout is not None:
+            self.routing_table.refresh(packet.dest, self.env.now + self.route_timeout)
+        if self.log_routes is not None:
+            self.log_routes.record(self.env.now, self.node_id, EventType.DATA_SENT, self.node_id, packet.dest, 0,
+                                   target_node.node_id)
+        self.send(packet, target_node)
+
+    def send_demo_data(self, dest_id):
+        """Paquete de prueba que registra los nodos por los que pasa."""
+        #simulacion de un data
+        #el paquete lleva la lista de los nodos que toca (packet.path), formando el happy path
+        self.send_data(dest_id, {'message': 'Hola desde el nodo origen, validando la ruta calculada.'},
+                       record_path=True)
 
     def handle_data(self, packet):
         """
         Tomar decisiones de reenvio en nodos intermedios.
         Funcioon que maneja el tipo de mensaje DATA en el metodo receive.
         """
-        #registramos que el paquete acaba de pasar por este nodo
-        packet['payload']['path_taken'].append(self.node_id)
+        #registramos que el paquete acaba de pasar por este nodo (solo el paquete de prueba lleva la ruta)
+        if packet.path is not None:
+            packet.path.append(self.node_id)
+
+        if self.route_timeout is not None:
+            #usar la ruta la mantiene viva, en ambos sentidos
+            expiry = self.env.now + self.route_timeout
+            self.routing_table.refresh(packet.src, expiry)
+            self.routing_table.refresh(packet.dest, expiry)
 
         #si es el detino final:
-        if packet['dest'] == self.node_id:
-            print(f"[{self.env.now:0.2f}] EXITO DE TRANSMISION! Nodo {self.node_id} recibio el paquete de DATOS.")
-            print(f"    - Mensaje: '{packet['payload']['message']}'")
-            print(f"    - Ruta real recorrida: {packet['payload']['path_taken']}")
+        if packet.dest == self.node_id:
+            if self.log_routes is not None:
+                self.log_routes.record(self.env.now, self.node_id, EventType.DATA_DELIVERED, packet.src, packet.dest)
+            if self.data_sink is not None:
+                self.data_sink(packet)
         else:
             #no soy el destino. Consulto mi tabla de ruteo para hacer reenvio
-            next_hop = self.routing_table[packet['dest']]['next_hop']
-            target_node = next((n for n in self.neighbors if n.node_id == next_hop), None)
+            next_hop = self.routing_table.next_hop(packet.dest)
+            target_node = self.get_neighbor(next_hop)
 
             if target_node:
-                print(f"[{self.env.now:0.2f}] [DATOS] Nodo {self.node_id} reenvia paquete de DATOS hacia Nodo {next_hop}")
-                self.env.process(self.transmit(packet, target_node))
+                if self.log_hops is not None:
+                    self.log_hops.record(self.env.now, self.node_id, EventType.DATA_FORWARDED, packet.src, packet.dest,
+                                         0, next_hop)
+                self.send(packet, target_node)
+            else:
+                if self.log_routes is not None:
+                    self.log_routes.record(self.env.now, self.node_id, EventType.DATA_DROPPED, packet.src, packet.dest)
+                if self.detect_link_breaks:
+                    #quien nos sigue mandando DATA hacia 'dest' tiene una ruta que ya no sirve (RFC 3561, 6.11 ii)
+                    self.send_rerr(((packet.dest, self.routing_table.seq_no(packet.dest)),))
     # =================================================================================
 
 
+#despacho de 'receive' por tipo de paquete
+Node.dispatch = {
+    PacketType.HELLO: Node.handle_hello,
+    PacketType.RREQ: Node.handle_rreq,
+    PacketType.RREP: Node.handle_rrep,
+    PacketType.DATA: Node.handle_data,
+    PacketType.RERR: Node.handle_rerr,
+}
+#nodo apagado: todo lo que llega se ignora
+POWERED_OFF_DISPATCH = dict.fromkeys(PacketType, lambda node, packet: None)
+
+
+class HelloScheduler:
+    """
+    Beacons HELLO de toda la red con un solo proceso.
+    En lugar de un proceso 'transmit' por vecino y por ronda, cada ronda programa un unico Timeout
+    de LINK_DELAY cuyo callback entrega el HELLO de cada nodo a todos sus vecinos, en el mismo orden
+    (emisor, vecino) y en el mismo instante que lo hacia 'hello_worker'.
+    Con 'phases' (desfase de cada nodo dentro de HELLO_INTERVAL) cada nodo tiene su propia cadena de
+    Timeouts con callback, sin proceso: un evento por nodo y por ronda en lugar de uno por ronda.
+    """
+
+    def __init__(self, env, nodes, phases=None):
+        self.env = env
+        self.nodes = nodes
+        self.packets = [HelloPacket(node.node_id) for node in nodes]  #el HELLO de cada nodo no cambia entre rondas
+        self.monitored = [node for node in nodes if node.detect_link_breaks]
+        if phases is None:
+            self.env.process(self.run())
+        else:
+            for node, phase in zip(nodes, phases):
+                self.env.timeout(phase, node.node_id).callbacks.append(self.beacon)
+
+    def run(self):
+        while True:
+            for node in self.monitored:
+                node.check_links()  #una revision por ronda, antes de entregar los HELLO de esta ronda
+            self.env.timeout(LINK_DELAY).callbacks.append(self.deliver)
+            yield self.env.timeout(HELLO_INTERVAL)
+
+    def deliver(self, event):
+        for node, packet in zip(self.nodes, self.packets):
+            for neighbor in node.neighbors:
+                neighbor.receive(packet)
+
+    def beacon(self, event):
+        """Ronda de un solo nodo (con fases): revisa sus enlaces, envia su HELLO y programa el siguiente."""
+        node_id = event.value
+        node = self.nodes[node_id]
+        if node.detect_link_breaks:
+            node.check_links()
+        self.env.timeout(LINK_DELAY, node_id).callbacks.append(self.deliver_one)
+        self.env.timeout(HELLO_INTERVAL, node_id).callbacks.append(self.beacon)
+
+    def deliver_one(self, event):
+        packet = self.packets[event.value]
+        for neighbor in self.nodes[event.value].neighbors:
+            neighbor.receive(packet)
+
+
+def sweep_routes(env, routing_store, interval):
+    """Barrido periodico de las rutas caducadas que nadie ha vuelto a consultar."""
+    while True:
+        yield env.timeout(interval)
+        routing_store.sweep(env.now)
+
+
+def print_demo_delivery(packet):
+    """data_sink del ejemplo: muestra el contenido y la ruta del paquete de prueba."""
+    if packet.path is not None:
+        print(f"    - Mensaje: '{packet.payload['message']}'")
+        print(f"    - Ruta real recorrida: {packet.path}")
+
+
 #funcion para arrancar la simulacion
 def run_simulation(env, nodes, source_id, dest_id):
     yield env.timeout(1.0)  #esperamos que los HELLO dispersen sobre la red para poblar las tablas
     nodes[source_id].initiate_route_discovery(dest_id)
 
 
-def setup_network(num_nodes=20, area_size=100, coverage_radius=35): #no. nodos, area 'geografica', radio de covertura individual
-    env = simpy.Environment()
-    random.seed(42) #usamos una semilla para tener reproducividad en ejercicio.
+def setup_network(num_nodes=20, area_size=100, coverage_radius=35, batched_hello=True, fast_delivery=True, #no. nodos, area 'geografica', radio de covertura individual
+                  event_log=None, seed=42, rng=None, expanding_ring=False, intermediate_rrep=False, gratuitous_rrep=False,
+                  route_timeout=None, detect_link_breaks=False, hello_phases=False, broadcast_jitter=0.0, env=None,
+                  reachability_check=False):
+    if env is None:
+        env = simpy.Environment()  #o cualquier entorno con la misma interfaz, p. ej. motor_eventos.Engine
+    if rng is None:
+        #usamos una semilla para tener reproducividad en ejercicio. El generador es propio de esta red
+        #(no el global de 'random'), asi varias redes pueden construirse y simularse en el mismo proceso
+        rng = random.Random(seed)
+    #posiciones en un arreglo contiguo y adyacencia CSR calculada por bloques con NumPy
+    topology = Topology.random(num_nodes, area_size, coverage_radius, rng)
+    #todas las tablas de ruteo de la red en las mismas columnas; con reloj si las rutas caducan
+    routing_store = RoutingStore(clock=lambda: env.now) if route_timeout is not None else RoutingStore()
+    if reachability_check:
+        topology.connected_components()  #union-find de la red; Topology.update lo mantiene si los nodos se mueven
+    #desfase de HELLO de cada nodo, del mismo generador y despues de las posiciones (la topologia no cambia)
+    phases = [rng.uniform(0, HELLO_INTERVAL) for _ in range(num_nodes)] if hello_phases else [0.0] * num_nodes
     nodes = []
     for i in range(num_nodes):
         #instanciamos la calse Node con n nodos.
-        nodes.append(Node(env, i, random.uniform(0, area_size), random.uniform(0, area_size), coverage_radius))
+        node = Node(env, i, topology.positions[i, 0], topology.positions[i, 1], coverage_radius,
+                    start_hello=not batched_hello, fast_delivery=fast_delivery, routing_store=routing_store,
+                    expanding_ring=expanding_ring, intermediate_rrep=intermediate_rrep, gratuitous_rrep=gratuitous_rrep,
+                    route_timeout=route_timeout, detect_link_breaks=detect_link_breaks, hello_phase=phases[i],
+                    broadcast_jitter=broadcast_jitter, rng=rng, reachability_check=reachability_check,
+                    topology=topology)
+        node.set_event_log(event_log)
+        nodes.append(node)
+    if detect_link_breaks:
+        #al borrarse una ruta (caducada, en la consulta o en el barrido) se sueltan sus precursores
+        routing_store.on_release = lambda owner, dest: nodes[owner].drop_precursors(dest)
+    if batched_hello:
+        #una ronda de HELLO = un evento (o uno por nodo si hay fases), no un proceso por vecino
+        HelloScheduler(env, nodes, phases if hello_phases else None)
+    if route_timeout is not None:
+        env.process(sweep_routes(env, routing_store, route_timeout))  #un proceso para toda la red, no uno por ruta
     #for node in nodes: node.calculate_neighbors(nodes)
 
     for node in nodes:
         node.calculate_neighbors(nodes)
-        neighbor_ids = [n.node_id for n in node.neighbors]
-        print(f"Nodo {node.node_id:02d} posicionado en ({node.x:.1f}, {node.y:.1f}) -> Vecinos ({len(neighbor_ids)}): {neighbor_ids}")
-    print('===========================================================================================================================')
+
+    if event_log is not None and event_log.echo:
+        #la topologia solo se imprime si se pide salida en pantalla
+        for node in nodes:
+            neighbor_ids = [n.node_id for n in node.neighbors]
+            print(f"Nodo {node.node_id:02d} posicionado en ({node.x:.1f}, {node.y:.1f}) -> Vecinos ({len(neighbor_ids)}): {neighbor_ids}")
+        print('===========================================================================================================================')
     return env, nodes
 
 
 if __name__ == "__main__":
-    env, network = setup_network()
+    event_log = EventLog(LogLevel.HOPS, echo=True)  #misma salida en pantalla que antes, y ademas queda el registro
+    env, network = setup_network(event_log=event_log)
+    for node in network:
+        node.data_sink = print_demo_delivery
     env.process(run_simulation(env, network, 0, 19)) #proceso de prueba, ruta de nodo 0 a nodo 19
     env.run(until=15)  #hasta cumplir 15 eventos/tiempos/momentos
 
@@ -240,7 +747,7 @@ if __name__ == "__main__":
     print('===========================================================================================================================')
 
     '''
-        Con random.seed(42), el nodo 16 no tiene vecinos (esta muerto)
+        Con la semilla 42, el nodo 16 no tiene vecinos (esta muerto)
     '''
 
     env.process(run_simulation(env, network, 0, 16))  # proceso de prueba, ruta de nodo 0 a nodo 19
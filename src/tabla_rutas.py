@@ -0,0 +1,314 @@
+import math
+from array import array
+
+import numpy as np
+
+'''
+Tablas de ruteo de toda la red guardadas por columnas.
+Cada ruta ocupa un 'slot' en arreglos compactos (next_hop, hops, seq_no, expiry); cada nodo solo
+guarda un diccionario dest -> slot. Asi una ruta cuesta unos cuantos bytes en vez de un dict propio,
+y una foto de todas las rutas de la red es una copia de cada columna.
+Si el store tiene reloj ('clock'), una ruta caducada (expiry <= ahora) se borra al consultarla, y 'sweep'
+borra de una vez todas las caducadas; sin reloj las rutas no caducan.
+'''
+
+NO_ROUTE = -1
+UNKNOWN_SEQ = 0  #ruta sin no. de secuencia del destino (p. ej. aprendida por HELLO); los nodos empiezan en 1
+
+
+class RoutingStore:
+    """Columnas de rutas compartidas por todos los nodos de una red."""
+
+    FIELDS = ('next_hop', 'hops', 'seq_no', 'expiry')
+
+    def __init__(self, clock=None, on_release=None):
+        self.clock = clock  #funcion sin argumentos que regresa el tiempo simulado (p. ej. lambda: env.now)
+        self.on_release = on_release  #funcion (owner, dest) llamada al borrar una ruta (p. ej. soltar sus precursores)
+        self.owner = array('i')  #nodo al que pertenece la ruta
+        self.dest = array('i')
+        self.next_hop = array('i')
+        self.hops = array('i')
+        self.seq_no = array('i')
+        self.expiry = array('d')  #tiempo simulado en que la ruta deja de ser valida
+        self.free_slots = []  #slots de rutas borradas, se reutilizan antes de crecer las columnas
+        self.index = {}  #owner -> {dest: slot}
+
+    def table(self, owner):
+        """Vista tipo diccionario de la tabla de un nodo."""
+        return RoutingTable(self, owner)
+
+    def allocate(self, owner, dest):
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.owner[slot] = owner
+            self.dest[slot] = dest
+            self.hops[slot] = 0
+            self.seq_no[slot] = 0
+            self.expiry[slot] = math.inf
+            return slot
+        self.owner.append(owner)
+        self.dest.append(dest)
+        self.next_hop.append(NO_ROUTE)
+        self.hops.append(0)
+        self.seq_no.append(0)
+        self.expiry.append(math.inf)
+        return len(self.owner) - 1
+
+    def release(self, slot):
+        if self.on_release is not None:
+            self.on_release(self.owner[slot], self.dest[slot])
+        self.owner[slot] = NO_ROUTE
+        self.dest[slot] = NO_ROUTE
+        self.next_hop[slot] = NO_ROUTE
+        self.free_slots.append(slot)
+
+    def __len__(self):
+        return len(self.owner) - len(self.free_slots)
+
+    def sweep(self, now):
+        """Borra todas las rutas con expiry <= 'now'; regresa cuantas se borraron."""
+        stale = np.flatnonzero((np.frombuffer(self.expiry, dtype=np.float64) <= now) &
+                               (np.frombuffer(self.owner, dtype=np.int32) != NO_ROUTE))
+        for slot in stale.tolist():
+            del self.index[self.owner[slot]][self.dest[slot]]
+            self.release(slot)
+        return len(stale)
+
+    def bulk_update(self, owners, dest, next_hop, hops, seq_no, expiry=None):
+        """
+        RoutingTable.update_route hacia un mismo 'dest' en las tablas de muchos nodos a la vez (p. ej. las rutas
+        inversas de una inundacion completa). 'next_hop', 'hops' y 'expiry' pueden ser escalares o un valor por
+        owner. Regresa la mascara de las rutas que se escribieron; las demas solo extienden su expiry.
+        """
+        owners = np.asarray(owners, dtype=np.int64)
+        count = len(owners)
+        index = self.index
+        slots = np.fromiter((index.setdefault(owner, {}).get(dest, -1) for owner in owners.tolist()),
+                            dtype=np.int64, count=count)
+
+        #slots nuevos: primero los libres, despues se crecen las columnas de una vez
+        missing = np.flatnonzero(slots < 0)
+        if len(missing):
+            reused = [self.free_slots.pop() for _ in range(min(len(self.free_slots), len(missing)))]
+            start, extra = len(self.owner), len(missing) - len(reused)
+            for column, fill in ((self.owner, NO_ROUTE), (self.dest, NO_ROUTE), (self.next_hop, NO_ROUTE),
+                                 (self.hops, 0), (self.seq_no, UNKNOWN_SEQ), (self.expiry, math.inf)):
+                column.frombytes(np.full(extra, fill, dtype=column.typecode).tobytes())
+            new_slots = np.concatenate((np.array(reused, dtype=np.int64), np.arange(start, start + extra)))
+            slots[missing] = new_slots
+            for owner, slot in zip(owners[missing].tolist(), new_slots.tolist()):
+                index[owner][dest] = slot
+
+        #vistas sobre las columnas (ya no crecen hasta el final de la funcion)
+        col_owner, col_dest, col_next, col_hops, col_seq = (
+            np.frombuffer(c, dtype=np.int32) for c in (self.owner, self.dest, self.next_hop, self.hops, self.seq_no))
+        col_expiry = np.frombuffer(self.expiry, dtype=np.float64)
+        next_hop = np.broadcast_to(np.asarray(next_hop, dtype=np.int32), count)
+        hops = np.broadcast_to(np.asarray(hops, dtype=np.int32), count)
+
+        #misma regla que update_route; una ruta caducada cuenta como inexistente
+        live = np.ones(count, dtype=bool)
+        live[missing] = False
+        if self.clock is not None:
+            live &= col_expiry[slots] > self.clock()
+        known = col_seq[slots]
+        invalid = col_next[slots] == NO_ROUTE
+        stale = live & np.where(invalid, seq_no < known,
+                                (seq_no < known) | ((seq_no == known) & (hops >= col_hops[slots])))
+        write = ~stale
+
+        target = slots[write]
+        col_owner[target] = owners[write]
+        col_dest[target] = dest
+        col_next[target] = next_hop[write]
+        col_hops[target] = hops[write]
+        col_seq[target] = seq_no
+        if expiry is not None:
+            expiry = np.broadcast_to(np.asarray(expiry, dtype=np.float64), count)
+            col_expiry[target] = expiry[write]
+            kept = slots[stale]
+            col_expiry[kept] = np.maximum(col_expiry[kept], expiry[stale])
+        else:
+            col_expiry[target[~live[write]]] = math.inf  #slot nuevo o caducado: la ruta no caduca
+        return write
+
+    def snapshot(self):
+        """Copia de todas las rutas vivas de la red como arreglos NumPy (una copia por columna)."""
+        live = np.frombuffer(self.owner, dtype=np.int32) != NO_ROUTE
+        columns = {'owner': self.owner, 'dest': self.dest, 'next_hop': self.next_hop,
+                   'hops': self.hops, 'seq_no': self.seq_no}
+        snap = {name: np.frombuffer(col, dtype=np.int32)[live].copy() for name, col in columns.items()}
+        snap['expiry'] = np.frombuffer(self.expiry, dtype=np.float64)[live].copy()
+        return snap
+
+    def nbytes(self):
+        """Memoria de las columnas (sin contar el indice dest -> slot de cada nodo)."""
+        return sum(col.itemsize * len(col) for col in
+                   (self.owner, self.dest, self.next_hop, self.hops, self.seq_no, self.expiry))
+
+
+class RouteEntry:
+    """Acceso a una ruta con la misma forma que antes: entry['next_hop'], entry['hops']."""
+
+    __slots__ = ('store', 'slot')
+
+    def __init__(self, store, slot):
+        self.store = store
+        self.slot = slot
+
+    def __getitem__(self, field):
+        if field not in RoutingStore.FIELDS:
+            raise KeyError(field)
+        return getattr(self.store, field)[self.slot]
+
+    def __setitem__(self, field, value):
+        if field not in RoutingStore.FIELDS:
+            raise KeyError(field)
+        getattr(self.store, field)[self.slot] = value
+
+    def __repr__(self):
+        return repr({field: self[field] for field in RoutingStore.FIELDS})
+
+
+class RoutingTable:
+    """
+    Tabla de ruteo de un nodo sobre el RoutingStore de la red.
+    Lectura compatible con el dict anterior (dest in tabla, tabla[dest]['next_hop']);
+    las escrituras van por 'set_route' para no crear un dict por ruta.
+    La vista tipo dict solo muestra rutas usables: una ruta invalidada (next_hop = NO_ROUTE) se guarda
+    por su no. de secuencia hasta que caduca, y solo se ve con 'entry' y 'seq_no'.
+    """
+
+    __slots__ = ('store', 'owner', 'slots')
+
+    def __init__(self, store, owner):
+        self.store = store
+        self.owner = owner
+        self.slots = store.index.setdefault(owner, {})
+
+    def live_slot(self, dest):
+        """Slot de la ruta hacia 'dest', o None si no hay o ya caduco (en ese caso se borra aqui mismo)."""
+        slot = self.slots.get(dest)
+        if slot is not None and self.store.clock is not None and self.store.expiry[slot] <= self.store.clock():
+            self.store.release(self.slots.pop(dest))
+            return None
+        return slot
+
+    def route_slot(self, dest):
+        """Como live_slot, pero None tambien si la ruta esta invalidada."""
+        slot = self.live_slot(dest)
+        if slot is not None and self.store.next_hop[slot] == NO_ROUTE:
+            return None
+        return slot
+
+    def usable_slots(self):
+        """(dest, slot) de las rutas usables, sin borrar las caducadas (se puede iterar sin copiar)."""
+        store = self.store
+        now = None if store.clock is None else store.clock()
+        return ((dest, slot) for dest, slot in self.slots.items()
+                if store.next_hop[slot] != NO_ROUTE and (now is None or store.expiry[slot] > now))
+
+    def __contains__(self, dest):
+        return self.route_slot(dest) is not None
+
+    def __len__(self):
+        return sum(1 for _ in self.usable_slots())
+
+    def __iter__(self):
+        return (dest for dest, _ in self.usable_slots())
+
+    def __getitem__(self, dest):
+        slot = self.route_slot(dest)
+        if slot is None:
+            raise KeyError(dest)
+        return RouteEntry(self.store, slot)
+
+    def __setitem__(self, dest, entry):
+        self.set_route(dest, **entry)
+
+    def __delitem__(self, dest):
+        self.store.release(self.slots.pop(dest))
+
+    def get(self, dest, default=None):
+        slot = self.route_slot(dest)
+        return default if slot is None else RouteEntry(self.store, slot)
+
+    def entry(self, dest):
+        """Entrada hacia 'dest' aunque este invalidada (guarda su no. de secuencia), o None si no hay."""
+        slot = self.live_slot(dest)
+        return None if slot is None else RouteEntry(self.store, slot)
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return ((dest, RouteEntry(self.store, slot)) for dest, slot in self.usable_slots())
+
+    def hops(self, dest):
+        """Saltos hacia 'dest' o None si no hay ruta."""
+        slot = self.live_slot(dest)
+        return None if slot is None else self.store.hops[slot]
+
+    def next_hop(self, dest):
+        slot = self.live_slot(dest)
+        return None if slot is None else self.store.next_hop[slot]
+
+    def set_route(self, dest, next_hop, hops, seq_no=None, expiry=None):
+        slot = self.slots.get(dest)
+        if slot is None:
+            slot = self.slots[dest] = self.store.allocate(self.owner, dest)
+        store = self.store
+        store.next_hop[slot] = next_hop
+        store.hops[slot] = hops
+        if seq_no is not None:
+            store.seq_no[slot] = seq_no
+        if expiry is not None:
+            store.expiry[slot] = expiry
+
+    def seq_no(self, dest):
+        """No. de secuencia conocido de 'dest' (UNKNOWN_SEQ si no hay ruta)."""
+        slot = self.live_slot(dest)
+        return UNKNOWN_SEQ if slot is None else self.store.seq_no[slot]
+
+    def update_route(self, dest, next_hop, hops, seq_no=UNKNOWN_SEQ, expiry=None):
+        """
+        Regla de AODV: la ruta nueva reemplaza a la conocida si es mas fresca (no. de secuencia mayor)
+        o igual de fresca y mas corta. Regresa True si se escribio; si no, solo se extiende su expiry.
+        """
+        slot = self.live_slot(dest)
+        if slot is not None:
+            known = self.store.seq_no[slot]
+            if self.store.next_hop[slot] == NO_ROUTE:
+                stale = seq_no < known  #ruta invalidada: basta un no. de secuencia igual de nuevo
+            else:
+                stale = seq_no < known or (seq_no == known and hops >= self.store.hops[slot])
+            if stale:
+                if expiry is not None:
+                    self.refresh(dest, expiry)
+                return False
+        self.set_route(dest, next_hop, hops, seq_no, expiry)
+        return True
+
+    def invalidate(self, dest, seq_no=UNKNOWN_SEQ, expiry=None):
+        """
+        Marca la ruta hacia 'dest' como invalida (next_hop = NO_ROUTE) sin borrarla: su no. de secuencia sube
+        (o toma 'seq_no' si es mayor) para que el siguiente RREQ pida una ruta mas nueva. Regresa ese no.
+        """
+        slot = self.slots[dest]
+        store = self.store
+        store.next_hop[slot] = NO_ROUTE
+        store.seq_no[slot] = max(store.seq_no[slot] + 1, seq_no)
+        if expiry is not None:
+            store.expiry[slot] = expiry
+        return store.seq_no[slot]
+
+    def dests_via(self, next_hop):
+        """Destinos cuyas rutas pasan por el vecino 'next_hop'."""
+        column = self.store.next_hop
+        return [dest for dest, slot in self.slots.items() if column[slot] == next_hop]
+
+    def refresh(self, dest, expiry):
+        """Extiende la vida de la ruta hacia 'dest' hasta 'expiry' (nunca la acorta)."""
+        slot = self.live_slot(dest)
+        if slot is not None and self.store.expiry[slot] < expiry:
+            self.store.expiry[slot] = expiry
@@ -0,0 +1,261 @@
+import numpy as np
+
+
+CELL_STRIDE = 1 << 31  #llave de celda = cx * CELL_STRIDE + cy
+NEIGHBOR_CELLS = tuple(dx * CELL_STRIDE + dy for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+
+
+def build_csr(num_nodes, rows, cols):
+    """Convierte la lista de pares en CSR: vecinos de i = indices[indptr[i]:indptr[i + 1]], ordenados por id."""
+    order = np.lexsort((cols, rows))
+    indices = cols[order].astype(np.int32)
+    counts = np.bincount(rows, minlength=num_nodes)
+    indptr = np.zeros(num_nodes + 1, dtype=np.int32)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr, indices
+
+
+def cell_keys(positions, cell_size):
+    """Llave entera de la celda de cuadricula de cada posicion."""
+    cells = np.floor(positions / cell_size).astype(np.int64)
+    return cells[:, 0] * CELL_STRIDE + cells[:, 1]
+
+
+def cell_pairs(keys, members):
+    """
+    Pares (i, j), i < j, de nodos en celdas vecinas (bloque 3x3) donde al menos uno esta en 'members'.
+    Cada par sale una sola vez: si ambos extremos estan en 'members' lo genera el de menor id.
+    """
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    is_member = np.zeros(len(keys), dtype=bool)
+    is_member[members] = True
+
+    rows, cols = [], []
+    for offset in NEIGHBOR_CELLS:
+        lo = np.searchsorted(sorted_keys, keys[members] + offset, side='left')
+        hi = np.searchsorted(sorted_keys, keys[members] + offset, side='right')
+        counts = hi - lo
+        total = int(counts.sum())
+        if not total:
+            continue
+        #expande cada rango [lo, hi) sin ciclo de Python
+        src = np.repeat(members, counts)
+        firsts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+        other = order[firsts + np.arange(total)]
+        keep = (other != src) & (~is_member[other] | (src < other))
+        rows.append(np.minimum(src[keep], other[keep]))
+        cols.append(np.maximum(src[keep], other[keep]))
+
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(rows), np.concatenate(cols)
+
+
+class NeighborView:
+    """
+    Vista de solo lectura de los vecinos de un nodo sobre la fila CSR.
+    No guarda referencias a los nodos vecinos: solo el rango de ids y la lista global de nodos.
+    """
+
+    __slots__ = ('ids', 'nodes')
+
+    def __init__(self, ids, nodes):
+        self.ids = ids  #slice (vista) de Topology.indices, no es copia; con movilidad se reasigna en cada paso
+        self.nodes = nodes
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        nodes = self.nodes
+        return (nodes[j] for j in self.ids.tolist())
+
+    def __getitem__(self, k):
+        return self.nodes[int(self.ids[k])]
+
+    def __bool__(self):
+        return len(self.ids) > 0
+
+
+class Components:
+    """
+    Componentes conexas de la red con union-find (union por tamanio y compresion de caminos a la mitad).
+    Un enlace nuevo es una union; un enlace que desaparece puede partir su componente, asi que esas
+    componentes (y solo esas) se rearman desde cero con los enlaces que les quedan.
+    """
+
+    def __init__(self, num_nodes):
+        self.parent = list(range(num_nodes))
+        self.size = [1] * num_nodes
+        self.count = num_nodes  #numero de componentes
+        self.labels = None  #raiz de cada nodo (arreglo NumPy), se arma al pedirla y se borra al cambiar algo
+
+    def find(self, node):
+        parent = self.parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        self.count -= 1
+        self.labels = None
+
+    def union_pairs(self, rows, cols):
+        for a, b in zip(rows.tolist(), cols.tolist()):
+            self.union(a, b)
+
+    def connected(self, a, b):
+        return self.find(a) == self.find(b)
+
+    def component_labels(self):
+        """Raiz de la componente de cada nodo; dos nodos se alcanzan si tienen la misma."""
+        if self.labels is None:
+            self.labels = np.array([self.find(node) for node in range(len(self.parent))], dtype=np.int32)
+        return self.labels
+
+    def split(self, members, rows, cols):
+        """
+        Rearma las componentes de 'members' (mascara) desde cero con los enlaces (rows, cols) entre ellos;
+        'members' debe cubrir componentes completas y cada enlace debe venir una sola vez.
+        """
+        labels = self.component_labels()
+        ids = np.flatnonzero(members).tolist()
+        self.count += len(ids) - len(set(labels[members].tolist()))  #se deshacen y cada nodo queda solo
+        for node in ids:
+            self.parent[node] = node
+            self.size[node] = 1
+        self.labels = None
+        inside = members[rows] & members[cols]
+        self.union_pairs(rows[inside], cols[inside])
+
+    @classmethod
+    def from_csr(cls, num_nodes, indptr, indices):
+        components = cls(num_nodes)
+        rows = np.repeat(np.arange(num_nodes, dtype=np.int32), np.diff(indptr))
+        upper = rows < indices  #cada enlace una sola vez
+        components.union_pairs(rows[upper], indices[upper])
+        return components
+
+
+class Topology:
+    """
+    Topologia de la red.
+    Las posiciones viven en un arreglo contiguo float64 de (N, 2) y la adyacencia en CSR
+    (indptr/indices int32), 4 bytes por arista en lugar de una lista de objetos Node por nodo.
+    Los vecinos salen de una cuadricula con celdas del tamanio del radio: cada nodo solo se compara con
+    los de su bloque 3x3 de celdas (pares candidatos), nunca se arma la matriz NxN.
+    Si las posiciones se mueven en su lugar, 'update' rehace la adyacencia de forma incremental.
+    """
+
+    def __init__(self, positions, coverage_radius):
+        self.positions = np.ascontiguousarray(positions, dtype=np.float64)
+        self.coverage_radius = coverage_radius
+        #celda de cada nodo y pares candidatos (nodos en celdas vecinas, i < j); 'update' los mantiene
+        self.cells = None
+        self.candidate_rows = None
+        self.candidate_cols = None
+        self.components = None  #Components, se arma con el primer 'connected_components' y 'update' la mantiene
+        self.rebuild()
+
+    @property
+    def num_nodes(self):
+        return len(self.positions)
+
+    @property
+    def num_edges(self):
+        return len(self.indices) // 2  #cada enlace aparece una vez en cada extremo
+
+    def rebuild(self):
+        """Recalcula la cuadricula, los candidatos y la adyacencia completa a partir de las posiciones actuales."""
+        self.cells = cell_keys(self.positions, self.coverage_radius)
+        self.candidate_rows, self.candidate_cols = cell_pairs(self.cells, np.arange(self.num_nodes))
+        a, b = self.linked_candidates()
+        self.indptr, self.indices = build_csr(self.num_nodes, np.concatenate((a, b)), np.concatenate((b, a)))
+        if self.components is not None:
+            self.components = Components.from_csr(self.num_nodes, self.indptr, self.indices)
+
+    def update(self):
+        """
+        Rehace la adyacencia despues de mover 'positions' en su lugar y regresa los ids de los nodos
+        cuyos vecinos cambiaron. Los pares candidatos (nodos en celdas vecinas) solo se recalculan para
+        los nodos que cruzaron a otra celda; luego se mide la distancia de todos los candidatos de una vez.
+        """
+        keys = cell_keys(self.positions, self.coverage_radius)
+        crossed = np.flatnonzero(keys != self.cells)
+        if len(crossed):
+            moved = np.zeros(self.num_nodes, dtype=bool)
+            moved[crossed] = True
+            keep = ~(moved[self.candidate_rows] | moved[self.candidate_cols])
+            rows, cols = cell_pairs(keys, crossed)
+            self.candidate_rows = np.concatenate((self.candidate_rows[keep], rows))
+            self.candidate_cols = np.concatenate((self.candidate_cols[keep], cols))
+        self.cells = keys
+
+        a, b = self.linked_candidates()
+        old_edges = self.edge_keys()
+        self.indptr, self.indices = build_csr(self.num_nodes, np.concatenate((a, b)), np.concatenate((b, a)))
+        new_edges = self.edge_keys()
+        if self.components is not None:
+            self.update_components(np.setdiff1d(new_edges, old_edges, assume_unique=True),
+                                   np.setdiff1d(old_edges, new_edges, assume_unique=True), a, b)
+        changed_edges = np.setxor1d(old_edges, new_edges, assume_unique=True)
+        return np.unique(changed_edges // self.num_nodes)
+
+    def linked_candidates(self):
+        """Los pares candidatos (i < j) que estan dentro del radio: cada enlace una vez."""
+        a, b = self.candidate_rows, self.candidate_cols
+        delta = self.positions[a] - self.positions[b]
+        linked = np.hypot(delta[:, 0], delta[:, 1]) <= self.coverage_radius
+        return a[linked], b[linked]
+
+    def connected_components(self):
+        """Las Components de la adyacencia actual (se arman la primera vez, despues solo se actualizan)."""
+        if self.components is None:
+            self.components = Components.from_csr(self.num_nodes, self.indptr, self.indices)
+        return self.components
+
+    def update_components(self, added, removed, rows, cols):
+        """
+        Aplica a las componentes los enlaces que aparecieron y desaparecieron (llaves de edge_keys) en un
+        'update'; (rows, cols) son todos los enlaces actuales, cada uno una vez (rows < cols).
+        """
+        components = self.components
+        n = self.num_nodes
+        if len(removed):
+            #solo las componentes que perdieron un enlace pueden partirse; se rearman con sus enlaces actuales
+            labels = components.component_labels()
+            members = np.isin(labels, labels[removed // n])
+            components.split(members, rows, cols)
+        components.union_pairs(added // n, added % n)
+
+    def edge_keys(self):
+        """Cada arista dirigida (i, j) como el entero i * N + j, en orden."""
+        rows = np.repeat(np.arange(self.num_nodes, dtype=np.int64), np.diff(self.indptr))
+        return rows * self.num_nodes + self.indices
+
+    def neighbor_ids(self, node_id):
+        return self.indices[self.indptr[node_id]:self.indptr[node_id + 1]]
+
+    def degree(self, node_id):
+        return int(self.indptr[node_id + 1] - self.indptr[node_id])
+
+    def neighbor_view(self, node_id, nodes):
+        return NeighborView(self.neighbor_ids(node_id), nodes)
+
+    @classmethod
+    def random(cls, num_nodes, area_size, coverage_radius, rng):
+        """Posiciones uniformes en el area, tomando (x, y) por nodo en el mismo orden que setup_network."""
+        positions = np.empty((num_nodes, 2), dtype=np.float64)
+        for i in range(num_nodes):
+            positions[i, 0] = rng.uniform(0, area_size)
+            positions[i, 1] = rng.uniform(0, area_size)
+        return cls(positions, coverage_radius)
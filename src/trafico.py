@@ -0,0 +1,175 @@
+import math
+import random
+from array import array
+
+import numpy as np
+
+'''
+Generador de trafico con muchos flujos concurrentes (CBR, Poisson y on/off) sobre la red AODV.
+Cada flujo usa la ruta que ya tenga el origen en su routing_table; si no hay ruta, el paquete queda
+retenido en el origen mientras dura la busqueda hacia el destino (una sola por destino, la comparten
+todos los flujos que van hacia el), y solo se cuenta como 'sin ruta' si ese buffer esta lleno o si la
+busqueda falla en el acto (reachability_check). add_random_flows puede limitarse a pares alcanzables.
+Ningun flujo crea un proceso de SimPy: el siguiente paquete es un Timeout con callback.
+'''
+
+
+class Flow:
+    """Fuente CBR: un paquete cada 1/rate segundos entre 'start' y 'stop'."""
+
+    def __init__(self, flow_id, source, dest, rate, start=0.0, stop=math.inf):
+        self.flow_id = flow_id
+        self.source = source
+        self.dest = dest
+        self.rate = rate  #paquetes por segundo
+        self.start = start
+        self.stop = stop
+
+    def next_interval(self, rng, now):
+        return 1.0 / self.rate
+
+
+class PoissonFlow(Flow):
+    """Llegadas de Poisson: tiempos entre paquetes exponenciales con media 1/rate."""
+
+    def next_interval(self, rng, now):
+        return rng.expovariate(self.rate)
+
+
+class OnOffFlow(Flow):
+    """
+    Alterna periodos ON (CBR a 'rate') y OFF (silencio), ambos exponenciales
+    con medias 'mean_on' y 'mean_off'.
+    """
+
+    def __init__(self, flow_id, source, dest, rate, mean_on, mean_off, start=0.0, stop=math.inf):
+        super().__init__(flow_id, source, dest, rate, start, stop)
+        self.mean_on = mean_on
+        self.mean_off = mean_off
+        self.on_until = None  #fin del periodo ON actual, se sortea con el primer paquete
+
+    def next_interval(self, rng, now):
+        if self.on_until is None:
+            self.on_until = now + rng.expovariate(1.0 / self.mean_on)
+        interval = 1.0 / self.rate
+        if now + interval <= self.on_until:
+            return interval
+        #termina el periodo ON: silencio y luego un nuevo periodo ON
+        off = rng.expovariate(1.0 / self.mean_off)
+        self.on_until = now + off + rng.expovariate(1.0 / self.mean_on)
+        return off
+
+
+class TrafficStats:
+    """Contadores por flujo en arreglos compactos y la latencia de cada paquete entregado."""
+
+    def __init__(self, env):
+        self.env = env
+        self.offered = array('i')  #paquetes que la fuente quiso enviar
+        self.sent = array('i')  #paquetes que el origen acepto (salieron o esperan la ruta)
+        self.no_route = array('i')  #paquetes descartados en el origen: sin ruta y el buffer de la busqueda lleno
+        self.delivered = array('i')
+        self.latencies = array('d')
+
+    def add_flow(self):
+        for column in (self.offered, self.sent, self.no_route, self.delivered):
+            column.append(0)
+
+    def record_delivery(self, packet):
+        if packet.flow_id is None:
+            return  #paquete de prueba, no pertenece a un flujo
+        self.delivered[packet.flow_id] += 1
+        self.latencies.append(self.env.now - packet.created)
+
+    def summary(self, duration):
+        offered = sum(self.offered)
+        delivered = sum(self.delivered)
+        latencies = np.frombuffer(self.latencies, dtype=np.float64)
+        delivered_any = len(latencies) > 0  #sin entregas no hay latencia que reportar: nan, no 0
+        return {
+            'flows': len(self.offered),
+            'offered': offered,
+            'sent': sum(self.sent),
+            'no_route': sum(self.no_route),
+            'delivered': delivered,
+            'delivery_ratio': delivered / offered if offered else math.nan,
+            'throughput_pps': delivered / duration,
+            'latency_mean': float(latencies.mean()) if delivered_any else math.nan,
+            'latency_p50': float(np.percentile(latencies, 50)) if delivered_any else math.nan,
+            'latency_p95': float(np.percentile(latencies, 95)) if delivered_any else math.nan,
+        }
+
+
+class TrafficGenerator:
+    """Programa los paquetes de todos los flujos y los entrega a 'Node.queue_data' del origen."""
+
+    def __init__(self, env, nodes, rng):
+        self.env = env
+        self.nodes = nodes
+        self.rng = rng
+        self.flows = []
+        self.stats = TrafficStats(env)
+        for node in nodes:
+            node.data_sink = self.stats.record_delivery
+            node.on_route_found = None  #los flujos envian por su cuenta, sin el paquete de prueba
+
+    def add_flow(self, flow):
+        flow.flow_id = len(self.flows)
+        self.flows.append(flow)
+        self.stats.add_flow()
+        self.env.timeout(max(flow.start - self.env.now, 0.0), flow).callbacks.append(self.fire)
+        return flow
+
+    def fire(self, event):
+        flow = event.value
+        now = self.env.now
+        if now >= flow.stop:
+            return
+
+        stats = self.stats
+        source = self.nodes[flow.source]
+        seq = stats.offered[flow.flow_id]
+        stats.offered[flow.flow_id] += 1
+        if source.queue_data(flow.dest, None, flow.flow_id, seq):
+            stats.sent[flow.flow_id] += 1
+        else:
+            stats.no_route[flow.flow_id] += 1
+
+        self.env.timeout(flow.next_interval(self.rng, now), flow).callbacks.append(self.fire)
+
+    def add_random_flows(self, count, flow_class=Flow, rate=1.0, start=0.0, stop=math.inf, reachable_only=False,
+                         **kwargs):
+        """
+        Crea 'count' flujos entre pares origen/destino distintos elegidos al azar. Con 'reachable_only' solo
+        se usan pares de la misma componente conexa de la topologia actual (se vuelve a sortear el par).
+        """
+        if reachable_only:
+            labels = self.nodes[0].topology.connected_components().component_labels()
+            if np.bincount(labels).max() < 2:
+                raise ValueError('ningun par de nodos esta conectado')
+        for _ in range(count):
+            source, dest = self.rng.sample(range(len(self.nodes)), 2)
+            while reachable_only and labels[source] != labels[dest]:
+                source, dest = self.rng.sample(range(len(self.nodes)), 2)
+            self.add_flow(flow_class(None, source, dest, rate, start=start, stop=stop, **kwargs))
+
+
+if __name__ == "__main__":
+    from escenarios import area_for, stream_seeds
+    from simulador_aodv import setup_network
+
+    num_nodes = 500
+    area_size = area_for(num_nodes)
+    warmup, duration = 1.0, 20.0
+
+    #la red y los flujos con generadores independientes (con la misma semilla darian la misma secuencia)
+    network_seed, traffic_seed = stream_seeds(42, 2)
+    env, nodes = setup_network(num_nodes, area_size, 35, seed=network_seed)
+    generator = TrafficGenerator(env, nodes, random.Random(traffic_seed))
+    generator.add_random_flows(80, Flow, rate=2.0, start=warmup)
+    generator.add_random_flows(80, PoissonFlow, rate=2.0, start=warmup)
+    generator.add_random_flows(40, OnOffFlow, rate=5.0, start=warmup, mean_on=2.0, mean_off=3.0)
+    env.run(until=warmup + duration)
+
+    for key, value in generator.stats.summary(duration).items():
+        print(f"{key:>15}: {value:.4f}" if isinstance(value, float) else f"{key:>15}: {value}")
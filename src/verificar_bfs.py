@@ -0,0 +1,137 @@
+import math
+import random
+
+import numpy as np
+
+from escenarios import area_for
+from inundacion import flood_tree, install_reverse_routes, discover_pairs
+from registro_eventos import EventLog, EventType, LogLevel
+from simulador_aodv import setup_network, Discovery, PATH_DISCOVERY_TIME, LINK_DELAY, NET_TRAVERSAL_TIME
+from tabla_rutas import RoutingStore
+
+'''
+Verifica que la inundacion en bloque (inundacion.py) deja lo mismo que la inundacion por eventos:
+para cada RREQ, las rutas inversas hacia el origen (siguiente salto y saltos) de todos los nodos y quienes
+las tienen, con y sin TTL; y para cada busqueda completa, los saltos del ROUTE_FOUND y el siguiente salto
+del origen hacia el destino. Ademas, que install_reverse_routes escribe las mismas columnas (con expiry)
+que las escrituras de handle_rreq.
+'''
+
+SIZES = (200, 500, 1000)
+COVERAGE_RADIUS = 35
+FLOODS = 8
+TTLS = (math.inf, 2, 4)
+
+
+def build(num_nodes, **options):
+    area_size = area_for(num_nodes)
+    event_log = EventLog(LogLevel.ROUTES)
+    env, nodes = setup_network(num_nodes, area_size, COVERAGE_RADIUS, event_log=event_log, **options)
+    for node in nodes:
+        node.on_route_found = None
+    env.run(until=1.0)  #los HELLO llenan las rutas a los vecinos, como en la simulacion
+    return env, nodes, event_log
+
+
+def reverse_routes(nodes, source, seq_no):
+    """(siguiente salto, saltos) de la ruta hacia 'source' escrita por el RREQ con 'seq_no', por nodo."""
+    next_hop = np.full(len(nodes), -1, dtype=np.int32)
+    hops = np.full(len(nodes), -1, dtype=np.int32)
+    for node in nodes:
+        entry = node.routing_table.get(source)
+        if entry is not None and entry['seq_no'] == seq_no:
+            next_hop[node.node_id], hops[node.node_id] = entry['next_hop'], entry['hops']
+    return next_hop, hops
+
+
+def check_floods(num_nodes, rng):
+    """Un RREQ por origen (origenes distintos), cada uno con su TTL y un destino que no lo reenvia."""
+    env, nodes, _ = build(num_nodes)
+    topology = nodes[0].topology
+    ok = True
+    for source in rng.sample(range(num_nodes), FLOODS):
+        ttl = rng.choice(TTLS)
+        dest = rng.randrange(num_nodes)
+        origin = nodes[source]
+        origin.send_rreq(Discovery(env, dest, ttl))
+        env.run(until=env.now + PATH_DISCOVERY_TIME)
+
+        parent, hops, _ = flood_tree(topology, source, ttl, stop=dest)
+        reached = hops > 0
+        event_next, event_hops = reverse_routes(nodes, source, origin.seq_no)
+        ok &= np.array_equal(np.where(reached, parent, -1), event_next)
+        ok &= np.array_equal(np.where(reached, hops, -1), event_hops)
+    return ok
+
+
+def check_discoveries(num_nodes, rng):
+    """Busquedas completas: saltos del ROUTE_FOUND y siguiente salto del origen contra discover_pairs."""
+    env, nodes, event_log = build(num_nodes)
+    sources = rng.sample(range(num_nodes), FLOODS)
+    pairs = [(source, rng.randrange(num_nodes)) for source in sources]
+    pairs = [(s, d) for s, d in pairs if s != d]
+    for source, dest in pairs:
+        nodes[source].initiate_route_discovery(dest)
+        env.run(until=env.now + PATH_DISCOVERY_TIME)
+
+    events = event_log.as_arrays()
+    found_hops = {(int(n), int(s)): int(h) for n, s, h, e in
+                  zip(events['node'], events['src'], events['hop_count'], events['event']) if e == EventType.ROUTE_FOUND}
+    result = discover_pairs(nodes[0].topology, pairs)
+    ok = True
+    for i, (source, dest) in enumerate(pairs):
+        if result['found'][i]:
+            ok &= found_hops.get((source, dest)) == result['hops'][i]
+            ok &= nodes[source].routing_table.next_hop(dest) == result['next_hop'][i]
+        else:
+            ok &= (source, dest) not in found_hops
+    return ok
+
+
+def check_install(num_nodes, rng):
+    """Las columnas que deja install_reverse_routes contra las que deja handle_rreq (con rutas que caducan)."""
+    env, nodes, _ = build(num_nodes, route_timeout=3.0)
+    topology = nodes[0].topology
+    source, dest = rng.sample(range(num_nodes), 2)
+    origin = nodes[source]
+    parent, hops, _ = flood_tree(topology, source, stop=dest)
+
+    #el RREQ sale justo despues de la ronda de HELLO de t=2 y se compara antes de la siguiente,
+    #para que ningun HELLO extienda la ruta hacia el origen de los vecinos
+    env.run(until=2.1)
+    start = env.now
+    finish = start + (int(hops.max()) + 1) * LINK_DELAY
+    assert finish < 4.0, 'red demasiado profunda para compararla entre dos rondas de HELLO'
+
+    #copia de las tablas antes del RREQ, en un store aparte con el mismo reloj
+    bulk = RoutingStore(clock=lambda: start)
+    for node in nodes:
+        table = bulk.table(node.node_id)
+        for dest_id, entry in node.routing_table.items():
+            table.set_route(dest_id, entry['next_hop'], entry['hops'], entry['seq_no'], entry['expiry'])
+
+    origin.send_rreq(Discovery(env, dest, math.inf))
+    env.run(until=finish)
+
+    #cada nodo escribe su ruta al recibir el RREQ, en start + hops * LINK_DELAY (misma suma que los eventos)
+    arrival = np.full(num_nodes, start)
+    for _ in range(int(hops.max())):
+        arrival = np.where(hops > np.round((arrival - start) / LINK_DELAY), arrival + LINK_DELAY, arrival)
+    install_reverse_routes(bulk, source, parent, hops, origin.seq_no, arrival + NET_TRAVERSAL_TIME)
+
+    ok = True
+    for node in nodes:
+        entry = node.routing_table.get(source)
+        bulk_entry = bulk.table(node.node_id).get(source)
+        if entry is None or bulk_entry is None:
+            ok &= entry is None and bulk_entry is None
+            continue
+        ok &= all(entry[f] == bulk_entry[f] for f in RoutingStore.FIELDS)
+    return ok
+
+
+if __name__ == "__main__":
+    rng = random.Random(3)
+    for num_nodes in SIZES:
+        print(f"{num_nodes:>6} nodos: rutas inversas = {check_floods(num_nodes, rng)}, "
+              f"busquedas = {check_discoveries(num_nodes, rng)}, install_reverse_routes = {check_install(num_nodes, rng)}")
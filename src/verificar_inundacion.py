@@ -0,0 +1,52 @@
+
+from escenarios import area_for
+from paquetes import PacketType
+from simulador_aodv import Node, setup_network, run_simulation
+
+'''
+Verifica que compartir un solo paquete por broadcast da las mismas tablas de ruteo que
+copiar el paquete para cada vecino (el comportamiento anterior), en varias topologias.
+Tambien cuenta cuantos objetos RREQ distintos se crean en cada caso.
+'''
+
+SIZES = (20, 500, 2000)
+COVERAGE_RADIUS = 35
+
+shared_broadcast = Node.broadcast
+
+
+def copying_broadcast(self, packet):
+    """Broadcast de referencia: una copia del paquete por vecino."""
+    for neighbor in self.neighbors:
+        self.send(packet.copy(), neighbor)
+
+
+def run_flood(num_nodes, broadcast):
+    sent_rreqs = []  #se guardan las referencias para que ningun id() se reutilice
+    original_send = Node.send
+
+    def recording_send(self, packet, receiver):
+        if packet.type == PacketType.RREQ:
+            sent_rreqs.append(packet)
+        original_send(self, packet, receiver)
+
+    Node.broadcast = broadcast
+    Node.send = recording_send
+    try:
+        area_size = area_for(num_nodes)
+        env, nodes = setup_network(num_nodes, area_size, COVERAGE_RADIUS)
+        env.process(run_simulation(env, nodes, 0, num_nodes - 1))
+        env.run(until=10)
+    finally:
+        Node.broadcast = shared_broadcast
+        Node.send = original_send
+    tables = [{d: (r['next_hop'], r['hops']) for d, r in n.routing_table.items()} for n in nodes]
+    return tables, len({id(p) for p in sent_rreqs})
+
+
+if __name__ == "__main__":
+    for num_nodes in SIZES:
+        shared_tables, shared_packets = run_flood(num_nodes, shared_broadcast)
+        copied_tables, copied_packets = run_flood(num_nodes, copying_broadcast)
+        print(f"{num_nodes:>6} nodos: tablas identicas = {shared_tables == copied_tables}, "
+              f"objetos RREQ: {copied_packets} (copia por vecino) -> {shared_packets} (compartido)")
@@ -0,0 +1,101 @@
+import random
+
+import numpy as np
+
+from escenarios import area_for
+from motor_eventos import Engine, CalendarEngine
+from registro_eventos import EventLog, LogLevel, COLUMNS
+from simulador_aodv import setup_network, run_simulation, ACTIVE_ROUTE_TIMEOUT, BROADCAST_JITTER
+from tabla_rutas import RoutingStore
+from trafico import Flow, PoissonFlow, TrafficGenerator
+
+'''
+Verifica que motor_eventos.Engine y CalendarEngine son intercambiables con simpy.Environment: la
+misma corrida con cada entorno debe dejar las mismas tablas de ruteo (todas las columnas de cada ruta), el mismo
+EventLog evento por evento y los mismos tiempos de entrega de cada paquete DATA.
+'''
+
+FEATURES = {'expanding_ring': True, 'intermediate_rrep': True, 'gratuitous_rrep': True,
+            'route_timeout': ACTIVE_ROUTE_TIMEOUT, 'detect_link_breaks': True, 'hello_phases': True,
+            'broadcast_jitter': BROADCAST_JITTER}
+
+
+def demo(env, options):
+    """La corrida de simulador_aodv: 20 nodos, ruta 0 -> 19 y despues 0 -> 16 (aislado)."""
+    event_log = EventLog(LogLevel.HOPS)
+    env, nodes = setup_network(event_log=event_log, env=env, **options)
+    deliveries = []
+    for node in nodes:
+        node.data_sink = lambda packet: deliveries.append((packet.src, packet.dest, env.now))
+    env.process(run_simulation(env, nodes, 0, 19))
+    env.run(until=15)
+    env.process(run_simulation(env, nodes, 0, 16))
+    env.run(until=300)
+    return nodes, event_log, deliveries
+
+
+def traffic(env, options, num_nodes=400, duration=30.0):
+    """Muchos flujos CBR y Poisson y nodos que se apagan y vuelven, para ejercitar RERR y caducidad."""
+    event_log = EventLog(LogLevel.HOPS)
+    area_size = area_for(num_nodes)
+    env, nodes = setup_network(num_nodes, area_size, 35, event_log=event_log, env=env, **options)
+    generator = TrafficGenerator(env, nodes, random.Random(5))
+    generator.add_random_flows(40, Flow, rate=4.0, start=1.0)
+    generator.add_random_flows(40, PoissonFlow, rate=4.0, start=1.0)
+    deliveries = []
+    for node in nodes:
+        node.data_sink = lambda packet: deliveries.append((packet.flow_id, packet.seq, env.now))
+
+    rng = random.Random(9)
+    endpoints = {n for flow in generator.flows for n in (flow.source, flow.dest)}
+    candidates = [node for node in nodes if node.node_id not in endpoints]
+
+    def churn():
+        while True:
+            yield env.timeout(2.0)
+            victim = rng.choice(candidates)
+            victim.power_off()
+            env.timeout(6.0, victim).callbacks.append(lambda event: event.value.power_on())
+
+    env.process(churn())
+    env.run(until=1.0 + duration)
+    return nodes, event_log, deliveries
+
+
+def tables(nodes):
+    """Cada ruta con todas sus columnas, en el orden de la tabla."""
+    return [[(dest, tuple(entry[f] for f in RoutingStore.FIELDS)) for dest, entry in node.routing_table.items()]
+            for node in nodes]
+
+
+def compare(scenario, options, engine_class):
+    simpy_nodes, simpy_log, simpy_deliveries = scenario(None, options)
+    engine_nodes, engine_log, engine_deliveries = scenario(engine_class(), options)
+    simpy_events, engine_events = simpy_log.as_arrays(), engine_log.as_arrays()
+    same_log = len(simpy_log) == len(engine_log) and all(
+        np.array_equal(simpy_events[c], engine_events[c]) for c in COLUMNS)
+    return {
+        'tablas': tables(simpy_nodes) == tables(engine_nodes),
+        'eventos': same_log,
+        'entregas': simpy_deliveries == engine_deliveries,
+        'n_eventos': len(simpy_log),
+        'n_entregas': len(simpy_deliveries),
+    }
+
+
+if __name__ == "__main__":
+    cases = (
+        ('demo', demo, {}),
+        ('demo, un proceso por salto', demo, {'fast_delivery': False}),
+        ('demo, HELLO por nodo', demo, {'batched_hello': False}),
+        ('demo, todas las opciones', demo, FEATURES),
+        ('trafico', traffic, {}),
+        ('trafico, todas las opciones', traffic, FEATURES),
+    )
+    for engine_class in (Engine, CalendarEngine):
+        for name, scenario, options in cases:
+            result = compare(scenario, options, engine_class)
+            ok = result['tablas'] and result['eventos'] and result['entregas']
+            print(f"{engine_class.__name__:>14} {name:>28}: {'OK' if ok else 'DIFERENTE'}  tablas={result['tablas']} "
+                  f"eventos={result['eventos']} entregas={result['entregas']} "
+                  f"({result['n_eventos']} eventos, {result['n_entregas']} entregas)")
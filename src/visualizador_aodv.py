@@ -2,14 +2,17 @@ import tkinter as tk
 import random
 import math
 
+from oraculo_rutas import shortest_path
+from topologia import Topology
+
 # ======== HARD CODE ============
 num_nodes = 20
 area_size = 100
 coverage_radius = 35
 seed = 42
 
-#happy path de 0 a 19:
-calculated_route = [0, 3, 12, 19]
+#happy path de 0 a 19: el camino que deja la inundacion de RREQ en la misma topologia (antes [0, 3, 12, 19] a mano)
+calculated_route = shortest_path(Topology.random(num_nodes, area_size, coverage_radius, random.Random(seed)), 0, 19)
 isolate_node = 16
 
 #======================================================
@@ -42,10 +45,10 @@ class VisualizadorRed:
 
     def generar_nodos(self):
         """Recrea las coordenadas exactas usando la misma semilla."""
-        random.seed(seed)
+        rng = random.Random(seed)  #generador propio, no altera el estado global de 'random'
         for id_nodo in range(num_nodes):
-            x = random.uniform(0, area_size)
-            y = random.uniform(0, area_size)
+            x = rng.uniform(0, area_size)
+            y = rng.uniform(0, area_size)
             self.nodos.append({'id': id_nodo, 'x': x, 'y': y})
 
     def neighbors(self, nodo1, nodo2):